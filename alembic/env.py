@@ -8,6 +8,8 @@ from alembic import context
 from app.core.settings import settings
 from app.core.database import Base
 from app.models.blog import User, Category, Post  # Import models here
+from app.models.upload import UploadJob, Upload, UploadSession
+from app.models.ranking import PostTrendingScore, RankingWatermark, PostRelated, PostRelatedBuild, PostView
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
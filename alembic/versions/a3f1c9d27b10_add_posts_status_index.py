@@ -0,0 +1,28 @@
+"""Add posts status index
+
+Revision ID: a3f1c9d27b10
+Revises: 5db0a4d6c33e
+Create Date: 2026-10-19 09:12:44.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d27b10'
+down_revision: Union[str, Sequence[str], None] = '5db0a4d6c33e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_posts_status_id', 'posts', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_status_id', table_name='posts')
@@ -42,7 +42,8 @@ def get_current_user(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         user_id: str = payload.get("sub")
-        if user_id is None:
+        # Scoped tokens (e.g. profiling tokens) are not login tokens
+        if user_id is None or "scope" in payload:
             raise credentials_exception
         token_data = TokenPayload(sub=int(user_id))
     except JWTError:
@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import Any
+from fastapi import Response
+from pydantic import TypeAdapter
+from app.core.settings import settings
+
+
+class ModelResponse(Response):
+    """JSON response whose body was already serialized from Pydantic models."""
+
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def model_response(schema: Any, content: Any, status_code: int = 200) -> Any:
+    """
+    Validate a handler's return value against its schema once and serialize
+    it straight to JSON bytes.
+
+    Returning a ``Response`` makes FastAPI skip its own ``response_model``
+    validation and encoding, so the ORM objects are read exactly once, in
+    the handler's thread. Keep ``response_model`` on the route for the
+    OpenAPI schema.
+
+    Args:
+        schema: Response type, e.g. ``PostSchema`` or ``List[PostSchema]``
+        content: ORM objects, rows or dicts matching the schema
+        status_code: HTTP status code
+
+    Returns:
+        A ``ModelResponse``, or ``content`` unchanged when
+        ``FAST_JSON_RESPONSES`` is off so FastAPI serializes it as usual
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return content
+    return ModelResponse(content=dump_json(schema, content), status_code=status_code)
+
+
+def dump_json(schema: Any, content: Any, exclude: Any = None) -> bytes:
+    """
+    Validate ``content`` against ``schema`` and serialize it to JSON bytes,
+    leaving out the fields in ``exclude``.
+    """
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True), exclude=exclude)
@@ -1,23 +1,132 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import List, Any, Optional, Iterator
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from app.api import deps
-from app.core.database import get_db
+from app.api.responses import model_response
+from app.core import profiling
+from app.core.database import get_db, SessionLocal
+from app.core.settings import settings
 from app.models.blog import User, UserRole, Post, PostStatus
-from app.schemas.blog import User as UserSchema, Post as PostSchema, PostStatus as PostStatusSchema
-from app.services import user_service
+from app.schemas.blog import (
+    User as UserSchema,
+    UserPage,
+    Post as PostSchema,
+    PostStatus as PostStatusSchema,
+    PostSummaryPage,
+    PostStatusBulkUpdate,
+    PostStatusBulkResult,
+)
+from app.schemas.profiling import ProfileInfo, ProfileToken
+from app.services import category_service, post_cache, related, user_service, post_service
 
 router = APIRouter()
 
-@router.get("/users", response_model=List[UserSchema])
+EXPORT_COLUMNS = ["id", "email", "full_name", "role", "is_active", "created_at"]
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+@router.get("/users", response_model=UserPage)
 def read_users(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_admin_user),
+    limit: int = Query(100, ge=1, le=1000),
+    after_id: Optional[int] = None,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
 ) -> Any:
     """
-    Retrieve all users. (Admin only)
+    Retrieve users one keyset page at a time. (Admin only)
+    
+    Pass the returned ``next_cursor`` as ``after_id`` to fetch the next page.
     """
-    return user_service.get_all_users(db)
+    users = user_service.get_users_page(
+        db,
+        limit=limit + 1,
+        after_id=after_id,
+        role=role,
+        is_active=is_active,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = users[-1].id
+    return model_response(UserPage, {"items": users, "next_cursor": next_cursor})
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _stream_users(export_format: ExportFormat, filters: dict) -> Iterator[str]:
+    # The request-scoped session may be closed before the body is fully sent,
+    # so the export owns its session for the lifetime of the stream.
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == ExportFormat.CSV:
+            writer.writerow(EXPORT_COLUMNS)
+        for i, row in enumerate(user_service.iter_users(db, **filters), start=1):
+            values = [_export_value(v) for v in row]
+            if export_format == ExportFormat.CSV:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))))
+                buffer.write("\n")
+            if i % 1000 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+@router.get("/users/export")
+def export_users(
+    current_user: User = Depends(deps.get_current_admin_user),
+    format: ExportFormat = ExportFormat.CSV,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Any:
+    """
+    Stream the filtered user list as CSV or NDJSON. (Admin only)
+    """
+    filters = {
+        "role": role,
+        "is_active": is_active,
+        "created_from": created_from,
+        "created_to": created_to,
+    }
+    if format == ExportFormat.CSV:
+        media_type = "text/csv"
+    else:
+        media_type = "application/x-ndjson"
+    return StreamingResponse(
+        _stream_users(format, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=users.{format.value}"},
+    )
 
 @router.put("/users/{user_id}/role", response_model=UserSchema)
 def update_user_role(
@@ -32,17 +141,44 @@ def update_user_role(
     user = user_service.update_user_role(db, user_id=user_id, role=role)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return model_response(UserSchema, user)
 
-@router.get("/posts/pending", response_model=List[PostSchema])
+@router.get("/posts/pending", response_model=PostSummaryPage)
 def read_pending_posts(
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_admin_user),
+    limit: int = Query(50, ge=1, le=500),
+    after_id: Optional[int] = None,
+) -> Any:
+    """
+    Retrieve the moderation queue one keyset page at a time, oldest first. (Admin only)
+    
+    Pass the returned ``next_cursor`` as ``after_id`` to fetch the next page.
+    """
+    posts = post_service.get_posts_page_by_status(
+        db, PostStatus.PENDING, limit=limit + 1, after_id=after_id
+    )
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = posts[-1].id
+    return model_response(PostSummaryPage, {"items": posts, "next_cursor": next_cursor})
+
+@router.put("/posts/status", response_model=PostStatusBulkResult)
+def update_posts_status(
+    update_in: PostStatusBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin_user),
 ) -> Any:
     """
-    Retrieve all pending posts. (Admin only)
+    Approve or reject many posts in one request. (Admin only)
     """
-    return db.query(Post).filter(Post.status == PostStatus.PENDING).all()
+    updated = post_service.bulk_update_status(db, update_in.ids, update_in.status)
+    post_cache.invalidate(update_in.ids)
+    category_service.invalidate_stats()
+    if update_in.status == PostStatus.PUBLISHED:
+        related.enqueue(update_in.ids)
+    return model_response(PostStatusBulkResult, {"updated": updated})
 
 @router.put("/posts/{post_id}/status", response_model=PostSchema)
 def update_post_status(
@@ -65,5 +201,45 @@ def update_post_status(
         post.published = False
         
     db.commit()
+    post_cache.invalidate([post_id])
+    category_service.invalidate_stats()
+    if status == PostStatus.PUBLISHED:
+        related.enqueue([post_id])
     db.refresh(post)
-    return post
+    return model_response(PostSchema, post)
+
+@router.post("/profiles/token", response_model=ProfileToken)
+def create_profile_token(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Issue a short-lived token; requests sending it in the ``X-Profile-Token``
+    header are profiled. (Admin only)
+    """
+    return {
+        "token": profiling.create_token(current_user.id),
+        "expires_in": settings.PROFILE_TOKEN_EXPIRE_SECONDS,
+    }
+
+@router.get("/profiles", response_model=List[ProfileInfo])
+def read_profiles(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    List stored request profiles, newest first. (Admin only)
+    """
+    return profiling.list_profiles()
+
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Download a profile as collapsed stacks, the input format of
+    flamegraph.pl, speedscope and inferno. (Admin only)
+    """
+    path = profiling.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.folded")
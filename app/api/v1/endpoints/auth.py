@@ -14,7 +14,7 @@ from app.services.user_service import (
     get_user_by_email,
     get_or_create_oauth_user
 )
-from app.services.google_oauth import oauth, get_google_user_info
+from app.services.google_oauth import get_oauth, get_google_user_info
 from app.api.deps import get_current_active_user
 
 router = APIRouter()
@@ -151,7 +151,7 @@ async def google_login(request: Request):
     with open("oauth_debug.log", "a") as f:
         f.write(f"DEBUG: Redirecting to Google with redirect_uri: {redirect_uri}\n")
     
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 
 @router.get("/google/callback")
@@ -170,7 +170,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
     try:
         # Exchange authorization code for access token
         print(f"DEBUG: Handling Google callback. Request URL: {request.url}")
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
         
         # Get user info from token
         user_info = await get_google_user_info(token)
@@ -1,13 +1,20 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Union
 from app.core.database import get_db
-from app.models.blog import Category
-from app.schemas.blog import Category as CategorySchema
+from app.api.responses import model_response
+from app.schemas.blog import Category as CategorySchema, CategoryWithStats
+from app.services import category_service
 
 router = APIRouter()
 
-@router.get("/", response_model=List[CategorySchema])
-def read_categories(db: Session = Depends(get_db)):
-    categories = db.query(Category).all()
-    return categories
+@router.get("/", response_model=Union[List[CategoryWithStats], List[CategorySchema]])
+def read_categories(db: Session = Depends(get_db), include_stats: bool = False):
+    """
+    Retrieve all categories. With ``include_stats``, each also carries its
+    number of published posts and a summary of the newest one.
+    """
+    if include_stats:
+        return model_response(List[CategoryWithStats], category_service.get_categories_with_stats(db))
+    categories = category_service.get_categories(db)
+    return model_response(List[CategorySchema], categories)
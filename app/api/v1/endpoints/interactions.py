@@ -1,10 +1,19 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.api.responses import model_response
 from app.core.database import get_db
 from app.models.blog import User, Post, Comment, Like
-from app.schemas.blog import Comment as CommentSchema, CommentCreate, Like as LikeSchema
+from app.schemas.blog import (
+    Comment as CommentSchema,
+    CommentCreate,
+    Like as LikeSchema,
+    BookmarkCheck,
+    BookmarkState,
+    PostSummaryPage,
+)
+from app.services import bookmark_service, post_cache
 
 router = APIRouter()
 
@@ -28,8 +37,9 @@ def create_comment(
     )
     db.add(db_comment)
     db.commit()
+    post_cache.invalidate([comment_in.post_id])
     db.refresh(db_comment)
-    return db_comment
+    return model_response(CommentSchema, db_comment)
 
 @router.get("/posts/{post_id}/comments", response_model=List[CommentSchema])
 def read_comments(
@@ -39,7 +49,8 @@ def read_comments(
     """
     Retrieve comments for a post.
     """
-    return db.query(Comment).filter(Comment.post_id == post_id).all()
+    comments = db.query(Comment).filter(Comment.post_id == post_id).all()
+    return model_response(List[CommentSchema], comments)
 
 @router.post("/posts/{post_id}/like", response_model=LikeSchema)
 def like_post(
@@ -61,8 +72,9 @@ def like_post(
     db_like = Like(post_id=post_id, user_id=current_user.id)
     db.add(db_like)
     db.commit()
+    post_cache.invalidate([post_id])
     db.refresh(db_like)
-    return db_like
+    return model_response(LikeSchema, db_like)
 
 @router.delete("/posts/{post_id}/like")
 def unlike_post(
@@ -83,4 +95,63 @@ def unlike_post(
     
     db.delete(db_like)
     db.commit()
+    post_cache.invalidate([post_id])
     return {"message": "Unliked successfully"}
+
+@router.put("/posts/{post_id}/bookmark", response_model=BookmarkState)
+def bookmark_post(
+    post_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Bookmark a published post. Repeating the request is harmless.
+    """
+    if not bookmark_service.add_bookmark(db, current_user.id, post_id):
+        raise HTTPException(status_code=404, detail="Post not found")
+    return model_response(BookmarkState, {"post_id": post_id, "bookmarked": True})
+
+@router.delete("/posts/{post_id}/bookmark", response_model=BookmarkState)
+def unbookmark_post(
+    post_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Remove a bookmark. Repeating the request is harmless.
+    """
+    bookmark_service.remove_bookmark(db, current_user.id, post_id)
+    return model_response(BookmarkState, {"post_id": post_id, "bookmarked": False})
+
+@router.get("/bookmarks", response_model=PostSummaryPage)
+def read_bookmarks(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+    limit: int = Query(20, ge=1, le=100),
+    before_id: Optional[int] = None,
+) -> Any:
+    """
+    Retrieve the current user's bookmarked posts one keyset page at a time, newest posts first.
+
+    Pass the returned ``next_cursor`` as ``before_id`` to fetch the next page.
+    """
+    posts = bookmark_service.get_bookmarks_page(
+        db, current_user.id, limit=limit + 1, before_id=before_id
+    )
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = posts[-1].id
+    return model_response(PostSummaryPage, {"items": posts, "next_cursor": next_cursor})
+
+@router.get("/bookmarks/check", response_model=BookmarkCheck)
+def check_bookmarks(
+    post_ids: List[int] = Query(..., min_length=1, max_length=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Check which of the given posts the current user has bookmarked, e.g. for a feed page.
+    """
+    bookmarked = bookmark_service.get_bookmarked_ids(db, current_user.id, post_ids)
+    return model_response(BookmarkCheck, {"bookmarked": sorted(bookmarked)})
@@ -0,0 +1,25 @@
+import os
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from app.services import storage
+
+router = APIRouter()
+
+@router.get("/{file_id}/{file_name}", response_class=FileResponse)
+def read_media(file_id: str, file_name: str):
+    """
+    Serve a file from local storage.
+    
+    FileResponse handles Range and conditional requests, and hands the file
+    to the server to send directly when it supports the pathsend extension.
+    """
+    backend = storage.get_storage()
+    if not isinstance(backend, storage.LocalStorage):
+        raise HTTPException(status_code=404, detail="File not found")
+    path = backend.resolve(file_id)
+    if path is None or file_name != os.path.basename(path):
+        raise HTTPException(status_code=404, detail="File not found")
+    return FileResponse(
+        path,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
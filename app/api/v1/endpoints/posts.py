@@ -2,9 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
-from app.models.blog import Post, User, PostStatus, Like
-from app.schemas.blog import Post as PostSchema, PostCreate
+from app.models.blog import Post, User, PostStatus
+from app.schemas.blog import Post as PostSchema, PostCreate, RelatedPost, TrendingPost
 from app.api.deps import get_current_active_user, get_current_writer_user
+from app.api.responses import ModelResponse, model_response
+from app.core.settings import settings
+from app.services import post_cache, post_service, related, trending, view_counter
 from sqlalchemy import func
 
 router = APIRouter()
@@ -30,10 +33,12 @@ def read_posts(
     posts = query.offset(skip).limit(limit).all()
     
     # Add likes count (this is simplified, ideally use a hybrid property or aggregated query)
+    views = view_counter.get_counts(db, [post.id for post in posts])
     for post in posts:
-        post.likes_count = db.query(Like).filter(Like.post_id == post.id).count()
+        post.likes_count = post_service.count_likes(db, post.id)
+        post.views = views[post.id]
         
-    return posts
+    return model_response(List[PostSchema], posts)
 
 @router.get("/my-posts", response_model=List[PostSchema])
 def read_my_posts(
@@ -47,17 +52,37 @@ def read_my_posts(
     """
     posts = db.query(Post).filter(Post.author_id == current_user.id).offset(skip).limit(limit).all()
     
+    views = view_counter.get_counts(db, [post.id for post in posts])
     for post in posts:
-        post.likes_count = db.query(Like).filter(Like.post_id == post.id).count()
+        post.likes_count = post_service.count_likes(db, post.id)
+        post.views = views[post.id]
         
-    return posts
+    return model_response(List[PostSchema], posts)
+
+@router.get("/trending", response_model=List[TrendingPost])
+def read_trending_posts(
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Retrieve published posts ranked by time-decayed likes and comments. (Public)
+    """
+    return model_response(List[TrendingPost], trending.get_trending(db, limit))
 
 @router.get("/{slug}", response_model=PostSchema)
 def read_post_by_slug(slug: str, db: Session = Depends(get_db)):
     """
     Retrieve a single post by slug. Only published posts are publicly accessible.
     """
-    post = db.query(Post).filter(Post.slug == slug).first()
+    if settings.FAST_JSON_RESPONSES:
+        cached = post_cache.get(slug)
+        if cached is not None:
+            post_id, body = cached
+            view_counter.record(post_id)
+            views = view_counter.get_counts(db, [post_id])[post_id]
+            return ModelResponse(content=post_cache.with_views(body, views))
+
+    post = post_service.get_post_by_slug(db, slug)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
@@ -65,8 +90,28 @@ def read_post_by_slug(slug: str, db: Session = Depends(get_db)):
         # If not published, only author or admin can view (this logic could be expanded)
         raise HTTPException(status_code=403, detail="Post not published")
         
-    post.likes_count = db.query(Like).filter(Like.post_id == post.id).count()
-    return post
+    view_counter.record(post.id)
+    post.likes_count = post_service.count_likes(db, post.id)
+    post.views = view_counter.get_counts(db, [post.id])[post.id]
+    if not settings.FAST_JSON_RESPONSES:
+        return post
+    body = post_cache.render(post)
+    post_cache.put(slug, post.id, body)
+    return ModelResponse(content=post_cache.with_views(body, post.views))
+
+@router.get("/{slug}/related", response_model=List[RelatedPost])
+def read_related_posts(
+    slug: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(5, ge=1, le=20),
+):
+    """
+    Retrieve posts related to a published post, best match first. (Public)
+    """
+    posts = related.get_related(db, slug, min(limit, settings.RELATED_POSTS))
+    if posts is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return model_response(List[RelatedPost], posts)
 
 @router.post("/", response_model=PostSchema)
 def create_post(
@@ -84,13 +129,14 @@ def create_post(
         status = PostStatus.DRAFT
         
     db_post = Post(
-        **post_in.model_dump(exclude={"status"}), 
+        **post_in.model_dump(exclude={"status", "image"}), 
         author_id=current_user.id,
         status=status,
         published=(status == PostStatus.PUBLISHED)
     )
+    post_service.set_post_image(db_post, post_in.image)
     db.add(db_post)
     db.commit()
     db.refresh(db_post)
-    return db_post
+    return model_response(PostSchema, db_post)
 
@@ -1,50 +1,196 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-from typing import List, Optional
+import asyncio
+import logging
+from fastapi import (
+    APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Header, Request, Response, status
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers, UploadFile as StarletteUploadFile
+from starlette.concurrency import run_in_threadpool
+from typing import Any, BinaryIO, List, Optional, Tuple
 from app.api import deps
-from app.models.blog import User
-from app.schemas.upload import FileUploadResponse, FileDeleteResponse
-from app.services import imagekit_service
+from app.core.database import get_db, SessionLocal
+from app.core.settings import settings
+from app.models.blog import User, UserRole
+from app.models.upload import UploadSession
+from app.schemas.upload import (
+    FileUploadResponse, FileDeleteResponse, UploadJobResponse, BatchUploadResponse,
+    UploadSessionCreate, UploadSessionResponse
+)
+from app.services import storage, upload_jobs, upload_service, upload_sessions
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/image", response_model=FileUploadResponse)
-async def upload_image(
-    file: UploadFile = File(...),
-    folder: str = Form("images"),
-    current_user: User = Depends(deps.get_current_active_user)
-):
+BATCH_MAX_FIELDS = 10  # non-file form fields accepted by /batch
+
+JOB_RESPONSES = {202: {"model": UploadJobResponse, "description": "Upload queued"}}
+
+def _ensure_size(file: UploadFile, max_size: int) -> None:
     """
-    Upload an image to ImageKit.
+    Reject a spooled upload whose size is already known to exceed the limit.
     """
-    if not file.content_type.startswith("image/"):
+    if file.size is not None and file.size > max_size:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File must be an image"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {max_size} byte limit"
+        )
+
+def _find_duplicate(db: Session, owner_id: int, sha256: str) -> Optional[dict]:
+    """
+    Return the owner's record for already-stored content, claiming it if needed.
+    """
+    existing = upload_service.find_duplicate(db, owner_id, sha256)
+    return upload_service.to_response(existing) if existing is not None else None
+
+def _hash_and_find(
+    db: Session, owner_id: int, fileobj: BinaryIO, max_size: int
+) -> Tuple[str, Optional[dict]]:
+    """
+    Hash a spooled upload and look up already-stored copies of it.
+    """
+    sha256 = upload_service.hash_file(fileobj, max_size)
+    return sha256, _find_duplicate(db, owner_id, sha256)
+
+def _record_upload(db: Session, owner_id: int, sha256: str, result: dict) -> dict:
+    """
+    Record a just-stored file, or return the owner's record for the same
+    content if it was already stored.
+    """
+    return upload_service.to_response(
+        upload_service.record_or_claim(db, owner_id, sha256, result)
+    )
+
+async def _store_upload(
+    file: UploadFile,
+    folder: str,
+    kind: str,
+    max_size: int,
+    current_user: User,
+    background: bool,
+    db: Session,
+) -> Any:
+    """
+    Stream an upload to storage, or queue it when ``background`` is set.
+
+    Content that is already stored is not uploaded again; the existing
+    file is returned (and, in background mode, as an already finished job).
+    Direct uploads are hashed from the spooled temp file before the
+    transfer; background uploads are hashed while they are spooled.
+    """
+    _ensure_size(file, max_size)
+    tags = [kind, f"user_{current_user.id}"]
+    
+    if background:
+        try:
+            spool_path, sha256 = await run_in_threadpool(upload_jobs.spool, file.file, max_size)
+        except storage.FileTooLargeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=str(e)
+            )
+        duplicate = await run_in_threadpool(_find_duplicate, db, current_user.id, sha256)
+        try:
+            if duplicate is not None:
+                await run_in_threadpool(upload_jobs.remove_spool, spool_path)
+                job = await upload_jobs.complete(current_user.id, file.filename, duplicate)
+            else:
+                job = await upload_jobs.enqueue(
+                    owner_id=current_user.id,
+                    spool_path=spool_path,
+                    file_name=file.filename,
+                    folder=f"atlania/{folder}",
+                    tags=tags,
+                    sha256=sha256,
+                    max_size=max_size
+                )
+        except upload_jobs.QueueFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(upload_jobs.to_response(job)),
+            headers={"Location": f"{settings.API_V1_STR}/upload/jobs/{job.id}"}
+        )
+    
+    try:
+        sha256, duplicate = await run_in_threadpool(
+            _hash_and_find, db, current_user.id, file.file, max_size
+        )
+    except storage.FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
         )
+    if duplicate is not None:
+        return duplicate
     
     try:
-        content = await file.read()
-        result = imagekit_service.upload_file(
-            file=content,
+        # Stream from the spooled temp file instead of reading it into memory
+        result = await storage.get_storage().upload_file(
+            file=file.file,
             file_name=file.filename,
             folder=f"atlania/{folder}",
-            tags=["image", f"user_{current_user.id}"]
+            tags=tags,
+            max_size=max_size
+        )
+    except storage.FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
         )
-        return result
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
+    
+    upload = await run_in_threadpool(
+        _record_upload, db, current_user.id, sha256, result
+    )
+    if upload["file_id"] != result["file_id"]:
+        # A concurrent request stored the same content first; keep its copy.
+        try:
+            await storage.get_storage().delete_file(result["file_id"])
+        except Exception:
+            logger.warning("Could not delete duplicate file %s", result["file_id"])
+    return upload
 
-@router.post("/video", response_model=FileUploadResponse)
+@router.post("/image", response_model=FileUploadResponse, responses=JOB_RESPONSES)
+async def upload_image(
+    file: UploadFile = File(...),
+    folder: str = Form("images"),
+    background: bool = Query(False, description="Queue the transfer and return a job (202)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Upload an image to the storage backend.
+    """
+    if not file.content_type.startswith("image/"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be an image"
+        )
+    
+    return await _store_upload(
+        file, folder, "image", settings.MAX_IMAGE_UPLOAD_SIZE, current_user, background, db
+    )
+
+@router.post("/video", response_model=FileUploadResponse, responses=JOB_RESPONSES)
 async def upload_video(
     file: UploadFile = File(...),
     folder: str = Form("videos"),
+    background: bool = Query(False, description="Queue the transfer and return a job (202)"),
+    db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user)
 ):
     """
-    Upload a video to ImageKit.
+    Upload a video to the storage backend.
     """
     if not file.content_type.startswith("video/"):
         raise HTTPException(
@@ -52,57 +198,292 @@ async def upload_video(
             detail="File must be a video"
         )
     
-    try:
-        content = await file.read()
-        result = imagekit_service.upload_file(
-            file=content,
-            file_name=file.filename,
-            folder=f"atlania/{folder}",
-            tags=["video", f"user_{current_user.id}"]
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+    return await _store_upload(
+        file, folder, "video", settings.MAX_VIDEO_UPLOAD_SIZE, current_user, background, db
+    )
 
-@router.post("/file", response_model=FileUploadResponse)
+@router.post("/file", response_model=FileUploadResponse, responses=JOB_RESPONSES)
 async def upload_general_file(
     file: UploadFile = File(...),
     folder: str = Form("files"),
+    background: bool = Query(False, description="Queue the transfer and return a job (202)"),
+    db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user)
 ):
     """
-    Upload any file to ImageKit.
+    Upload any file to the storage backend.
     """
+    return await _store_upload(
+        file, folder, "file", settings.MAX_FILE_UPLOAD_SIZE, current_user, background, db
+    )
+
+def _classify(content_type: Optional[str]) -> Tuple[str, int]:
+    """
+    Pick the upload kind and size limit for a content type.
+    """
+    content_type = content_type or ""
+    if content_type.startswith("image/"):
+        return "image", settings.MAX_IMAGE_UPLOAD_SIZE
+    if content_type.startswith("video/"):
+        return "video", settings.MAX_VIDEO_UPLOAD_SIZE
+    return "file", settings.MAX_FILE_UPLOAD_SIZE
+
+BATCH_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "required": ["files"],
+                "properties": {
+                    "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                    "folder": {"type": "string", "default": "images"},
+                },
+            }
+        }
+    },
+}
+
+@router.post(
+    "/batch", response_model=BatchUploadResponse,
+    openapi_extra={"requestBody": BATCH_REQUEST_BODY}
+)
+async def upload_batch(
+    request: Request,
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Upload many files in one request.
+    
+    Files are sent to the storage backend concurrently, at most
+    ``UPLOAD_BATCH_CONCURRENCY`` at a time. Each file gets its own result;
+    a failed file does not abort the rest of the batch.
+    """
+    # Parsed here rather than through File(...) so the file count is enforced
+    # while the body streams in: the parser gives up at the first part over
+    # the limit instead of spooling every part and counting afterwards.
+    form = await request.form(
+        max_files=settings.UPLOAD_BATCH_MAX_FILES, max_fields=BATCH_MAX_FIELDS
+    )
+    files = [f for f in form.getlist("files") if isinstance(f, StarletteUploadFile)]
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No files uploaded")
+    folder = form.get("folder")
+    if not isinstance(folder, str):
+        folder = "images"
+    
+    semaphore = asyncio.Semaphore(settings.UPLOAD_BATCH_CONCURRENCY)
+    
+    async def store(index: int, file: UploadFile) -> dict:
+        item = {"index": index, "file_name": file.filename, "status_code": status.HTTP_200_OK}
+        kind, max_size = _classify(file.content_type)
+        async with semaphore:
+            # Transfers run concurrently, so each one needs its own session
+            db = SessionLocal()
+            try:
+                item["result"] = await _store_upload(
+                    file, folder, kind, max_size, current_user, False, db
+                )
+            except HTTPException as e:
+                item["status_code"] = e.status_code
+                item["error"] = e.detail
+            except Exception:
+                # e.g. a storage or database error; the other files still go through
+                logger.exception("Batch upload of %r failed", file.filename)
+                item["status_code"] = status.HTTP_500_INTERNAL_SERVER_ERROR
+                item["error"] = "Upload failed"
+            finally:
+                await run_in_threadpool(db.close)
+        return item
+    
+    items = await asyncio.gather(*(store(i, f) for i, f in enumerate(files)))
+    succeeded = sum(1 for item in items if "error" not in item)
+    return {"items": items, "succeeded": succeeded, "failed": len(items) - succeeded}
+
+def _get_owned_session(db: Session, session_id: str, current_user: User) -> UploadSession:
+    session = upload_sessions.get_session(db, session_id)
+    if not session or session.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+@router.post("/sessions", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+def create_upload_session(
+    session_in: UploadSessionCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Start a resumable upload.
+    
+    Send the file in order with ``PATCH /sessions/{id}`` (raw bytes, with
+    an ``Upload-Offset`` header), then call ``POST /sessions/{id}/complete``.
+    After a dropped connection, ``GET /sessions/{id}`` returns the offset
+    to resume from.
+    """
+    _, max_size = _classify(session_in.content_type)
+    if session_in.size > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {max_size} byte limit"
+        )
+    session = upload_sessions.create_session(
+        db,
+        owner_id=current_user.id,
+        file_name=session_in.file_name,
+        content_type=session_in.content_type,
+        folder=session_in.folder,
+        size=session_in.size
+    )
+    response.headers["Location"] = f"{settings.API_V1_STR}/upload/sessions/{session.id}"
+    response.headers["Upload-Offset"] = "0"
+    return upload_sessions.to_response(session)
+
+@router.get("/sessions/{session_id}", response_model=UploadSessionResponse)
+def read_upload_session(
+    session_id: str,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Get the offset a resumable upload should continue from.
+    """
+    session = _get_owned_session(db, session_id, current_user)
+    response.headers["Upload-Offset"] = str(session.received)
+    return upload_sessions.to_response(session)
+
+@router.patch("/sessions/{session_id}", response_model=UploadSessionResponse)
+async def upload_session_chunk(
+    session_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., ge=0, description="Byte offset of this chunk"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Append the request body to a resumable upload.
+    
+    The chunk must start at the current offset; otherwise 409 is returned
+    with the expected offset in the ``Upload-Offset`` header.
+    """
+    session = await run_in_threadpool(_get_owned_session, db, session_id, current_user)
     try:
-        content = await file.read()
-        result = imagekit_service.upload_file(
-            file=content,
-            file_name=file.filename,
-            folder=f"atlania/{folder}",
-            tags=["file", f"user_{current_user.id}"]
+        offset = await upload_sessions.append_chunk(db, session, upload_offset, request.stream())
+    except upload_sessions.OffsetMismatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Upload-Offset": str(e.expected)}
         )
-        return result
-    except Exception as e:
+    except upload_sessions.ChunkOverflowError as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=str(e)
         )
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Upload session data is no longer available"
+        )
+    response.headers["Upload-Offset"] = str(offset)
+    return upload_sessions.to_response(session)
+
+@router.post("/sessions/{session_id}/complete", response_model=FileUploadResponse, responses=JOB_RESPONSES)
+async def complete_upload_session(
+    session_id: str,
+    background: bool = Query(False, description="Queue the transfer and return a job (202)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Store a fully received resumable upload and close its session.
+    """
+    session = await run_in_threadpool(_get_owned_session, db, session_id, current_user)
+    if session.received != session.size:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload is incomplete: {session.received} of {session.size} bytes received",
+            headers={"Upload-Offset": str(session.received)}
+        )
+    kind, max_size = _classify(session.content_type)
+    try:
+        fileobj = await run_in_threadpool(open, upload_sessions.spool_path(session.id), "rb")
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Upload session data is no longer available"
+        )
+    try:
+        file = UploadFile(
+            fileobj,
+            size=session.size,
+            filename=session.file_name,
+            headers=Headers({"content-type": session.content_type})
+        )
+        result = await _store_upload(
+            file, session.folder, kind, max_size, current_user, background, db
+        )
+    finally:
+        await run_in_threadpool(fileobj.close)
+    await run_in_threadpool(upload_sessions.delete_session, db, session)
+    return result
+
+@router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_upload_session(
+    session_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Abandon a resumable upload and discard the data received so far.
+    """
+    session = _get_owned_session(db, session_id, current_user)
+    upload_sessions.delete_session(db, session)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.get("/jobs/{job_id}", response_model=UploadJobResponse)
+def read_upload_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Poll the status of a background upload.
+    """
+    job = upload_jobs.get_job(db, job_id)
+    if not job or job.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return upload_jobs.to_response(job)
 
 @router.delete("/{file_id}", response_model=FileDeleteResponse)
 async def delete_file(
     file_id: str,
+    db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user)
 ):
     """
-    Delete a file from ImageKit.
+    Delete a file from the storage backend.
+    
+    Removes the current user's reference to the file. The stored file is
+    deleted once no references remain. Admins remove every reference.
     """
-    # Note: In a real app, you might want to verify that the user owns this file
-    # by checking a database record of uploads.
+    uploads = await run_in_threadpool(upload_service.get_uploads_by_file_id, db, file_id)
+    is_admin = current_user.role == UserRole.ADMIN
+    if not is_admin:
+        uploads = [u for u in uploads if u.owner_id == current_user.id]
+        if not uploads:
+            raise HTTPException(status_code=404, detail="File not found")
+    
+    remaining = 0
+    if uploads:
+        remaining = await run_in_threadpool(upload_service.remove_uploads, db, uploads)
+    if remaining:
+        return {"success": True, "message": "File reference removed"}
+    
     try:
-        imagekit_service.delete_file(file_id)
+        await storage.get_storage().delete_file(file_id)
         return {"success": True, "message": "File deleted successfully"}
     except Exception as e:
         raise HTTPException(
@@ -1,20 +1,88 @@
-from sqlalchemy import create_engine
+import time
+from typing import Any, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.settings import settings
+from app.core.metrics import instrument_engine
+from app.core import slow_queries
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
 # "check_same_thread" is required only for SQLite
 connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args=connect_args
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Created on first use rather than at import, so importing the app (or the
+# models, for CLI tools and Alembic) does not load the DB driver.
+_engine: Optional[Engine] = None
+
+
+def get_engine() -> Engine:
+    """
+    Get the database engine, creating it on first use.
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            SQLALCHEMY_DATABASE_URL, connect_args=connect_args
+        )
+        instrument_engine(_engine)
+        if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+            event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+    return _engine
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Statements that raise never get here; only completed ones are timed
+    duration = time.perf_counter() - context._query_started
+    if duration * 1000 < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+    if conn.get_execution_options().get(slow_queries.SKIP_OPTION):
+        return
+    slow_queries.record(conn.engine, statement, parameters, duration, executemany)
+
+
+def dispose_engine(close: bool = True) -> None:
+    """
+    Close the engine's pooled connections; the next use creates a new engine.
+
+    Args:
+        close: Close the connections. Pass False in a forked child so it
+            drops the parent's connections without closing them under it.
+    """
+    global _engine
+    if _engine is not None:
+        _engine.dispose(close=close)
+        _engine = None
+
+
+class LazySession(Session):
+    """Session that binds to the shared engine the first time it needs one."""
+
+    def get_bind(self, mapper=None, **kw: Any):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(mapper, **kw)
+
+
+SessionLocal = sessionmaker(class_=LazySession, autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from app.core.database import engine` working without eager creation
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
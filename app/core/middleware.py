@@ -0,0 +1,190 @@
+import logging
+import random
+import time
+from typing import Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import metrics, profiling
+from app.core.request_context import current_scope, route_template
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Allowance for multipart boundaries and the non-file form fields.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies over a per-path limit while they stream in.
+    
+    The declared Content-Length is checked before anything is read, and the
+    bytes actually received are counted chunk by chunk, so an oversized
+    upload is cut off at the limit instead of being spooled in full first.
+    Paths are matched by longest prefix; unmatched paths are not limited.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]):
+        self.app = app
+        # Longest prefix first so /upload/video wins over /upload
+        self.limits = sorted(limits.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def limit_for(self, path: str) -> Optional[int]:
+        for prefix, limit in self.limits:
+            if path.startswith(prefix):
+                return limit + MULTIPART_OVERHEAD
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit_for(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                await self.reject(send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail="Request body too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def reject(self, send: Send) -> None:
+        body = b'{"detail":"Request body too large"}'
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class RequestContextMiddleware:
+    """
+    Expose the request being handled through ``current_scope``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Record request count, latency and in-flight requests for Prometheus.
+
+    Requests are labelled with the matched route template (e.g.
+    ``/api/v1/posts/{slug}``) rather than the raw path, so label
+    cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500
+        in_progress = metrics.IN_PROGRESS.labels(method)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            template = route_template(scope) or metrics.UNMATCHED_ROUTE
+            metrics.REQUEST_LATENCY.labels(method, template).observe(elapsed)
+            metrics.REQUESTS.labels(method, template, str(status_code)).inc()
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests, picked by a signed ``X-Profile-Token`` header
+    or at random with probability ``sample_rate``.
+
+    Profiles are written after the response has been sent; see
+    ``app.core.profiling``.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None or not profiling.acquire():
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        sampler = profiling.Sampler(settings.PROFILE_INTERVAL)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            sampler.stop()
+            profiling.release()
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template(scope),
+                "status_code": status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "trigger": trigger,
+            }
+            try:
+                await run_in_threadpool(profiling.save, sampler, meta)
+            except Exception:
+                logger.exception("Could not save request profile")
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == profiling.PROFILE_HEADER:
+                return "header" if profiling.verify_token(value.decode("latin-1")) else None
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
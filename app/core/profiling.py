@@ -0,0 +1,219 @@
+"""
+On-demand per-request profiling.
+
+A request is profiled when it carries a valid profiling token in the
+``X-Profile-Token`` header (issued to admins by ``POST
+/admin/profiles/token``) or is picked by ``PROFILE_SAMPLE_RATE``. A
+sampling profiler thread then records the stacks of every busy thread
+until the response completes, so time spent in threadpool handlers is
+included, and writes them in the collapsed-stack format read by
+flamegraph.pl, speedscope and inferno. Requests running concurrently on
+the same worker show up in the same profile.
+
+Unprofiled requests only pay for a scan of their headers.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from jose import JWTError, jwt
+from app.core.settings import settings
+
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_TOKEN_SCOPE = "profile"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$")
+
+# Leaf functions of threads that are idle rather than working
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+}
+
+# Profiles running in this process; extra requests are not profiled
+# while the limit is reached, bounding the overhead.
+_running = 0
+_running_lock = threading.Lock()
+
+
+def create_token(user_id: int) -> str:
+    """
+    Issue a short-lived token that enables profiling of requests carrying it.
+
+    The token has no ``sub`` claim and carries a ``scope``, so it cannot
+    be used as a login token.
+
+    Args:
+        user_id: ID of the admin requesting it, recorded as ``issued_to``
+
+    Returns:
+        Encoded JWT, valid for ``PROFILE_TOKEN_EXPIRE_SECONDS``
+    """
+    expire = datetime.now(timezone.utc) + timedelta(seconds=settings.PROFILE_TOKEN_EXPIRE_SECONDS)
+    claims = {"exp": expire, "issued_to": str(user_id), "scope": PROFILE_TOKEN_SCOPE}
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def verify_token(token: str) -> bool:
+    """
+    Check a profiling token's signature, expiry and scope.
+    """
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return False
+    return claims.get("scope") == PROFILE_TOKEN_SCOPE
+
+
+def acquire() -> bool:
+    """
+    Reserve a profiling slot; False if ``PROFILE_MAX_CONCURRENT`` are in use.
+    """
+    global _running
+    with _running_lock:
+        if _running >= settings.PROFILE_MAX_CONCURRENT:
+            return False
+        _running += 1
+        return True
+
+
+def release() -> None:
+    """
+    Free a slot reserved with ``acquire``.
+    """
+    global _running
+    with _running_lock:
+        _running -= 1
+
+
+class Sampler(threading.Thread):
+    """
+    Samples the stacks of all other busy threads every ``interval`` seconds.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _collapse(frame)
+                if stack:
+                    self.stacks[stack] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def save(sampler: Sampler, meta: Dict[str, Any]) -> str:
+    """
+    Write a profile and its metadata, then drop the oldest profiles beyond
+    ``PROFILE_MAX_FILES``.
+
+    Args:
+        sampler: Stopped sampler
+        meta: Request details stored next to the profile
+
+    Returns:
+        Profile ID
+    """
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    # Timestamp first, so name order is age order
+    profile_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    lines = [f"{stack} {count}\n" for stack, count in sampler.stacks.most_common()]
+    with open(_path(profile_id, ".folded"), "w") as f:
+        f.writelines(lines)
+    meta = {
+        "id": profile_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "samples": sampler.samples,
+        "interval_ms": sampler.interval * 1000,
+        **meta,
+    }
+    with open(_path(profile_id, ".json"), "w") as f:
+        json.dump(meta, f)
+    _rotate()
+    return profile_id
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """
+    Get the metadata of stored profiles, newest first.
+    """
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(settings.PROFILE_DIR), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(settings.PROFILE_DIR, name)) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # rotated away or half-written
+    return profiles
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    """
+    Get the path of a stored profile, or None if there is no such profile.
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = _path(profile_id, ".folded")
+    return path if os.path.exists(path) else None
+
+
+def _path(profile_id: str, suffix: str) -> str:
+    return os.path.join(settings.PROFILE_DIR, profile_id + suffix)
+
+
+def _rotate() -> None:
+    profiles = sorted(
+        name[: -len(".folded")]
+        for name in os.listdir(settings.PROFILE_DIR)
+        if name.endswith(".folded")
+    )
+    for profile_id in profiles[: max(len(profiles) - settings.PROFILE_MAX_FILES, 0)]:
+        for suffix in (".folded", ".json"):
+            try:
+                os.remove(_path(profile_id, suffix))
+            except FileNotFoundError:
+                pass
+
+
+def _collapse(frame: Any) -> Optional[str]:
+    code = frame.f_code
+    if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+        return None
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    # Trim to the package-relative path; keeps frame names stable across hosts
+    marker = "site-packages" + os.sep
+    index = filename.find(marker)
+    if index != -1:
+        return filename[index + len(marker):]
+    return os.path.relpath(filename) if os.path.isabs(filename) else filename
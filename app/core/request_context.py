@@ -0,0 +1,34 @@
+"""
+The request being handled, for code far from the endpoint (such as DB
+event hooks) that wants to attribute work to a route.
+
+``RequestContextMiddleware`` sets ``current_scope`` for each request. The
+value follows the request into threadpool handlers, since Starlette copies
+the context into the worker thread.
+"""
+from contextvars import ContextVar
+from typing import Optional
+from starlette.types import Scope
+
+current_scope: ContextVar[Optional[Scope]] = ContextVar("current_scope", default=None)
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """
+    Get the template of the route a request matched (e.g.
+    ``/api/v1/posts/{slug}``), or None before routing or if none matched.
+    """
+    # The router stores the matched route in the (shared) scope. FastAPI
+    # versions that resolve included routers lazily keep the route's own
+    # relative path there and the full path in the effective route context.
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    route = context or scope.get("route")
+    return getattr(route, "path", None)
+
+
+def current_route() -> Optional[str]:
+    """
+    Get the route template of the request being handled, if any.
+    """
+    scope = current_scope.get()
+    return route_template(scope) if scope is not None else None
@@ -1,4 +1,6 @@
-from typing import List, Union, Optional
+import os
+import tempfile
+from typing import List, Literal, Union, Optional
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -26,6 +28,128 @@ class Settings(BaseSettings):
     IMAGEKIT_PUBLIC_KEY: Optional[str] = None
     IMAGEKIT_PRIVATE_KEY: Optional[str] = None
     IMAGEKIT_URL_ENDPOINT: Optional[str] = None
+    IMAGEKIT_UPLOAD_BASE_URL: str = "https://upload.imagekit.io"
+    IMAGEKIT_API_BASE_URL: str = "https://api.imagekit.io"
+
+    # Storage backend. "local" writes under LOCAL_STORAGE_DIR and serves
+    # files from LOCAL_STORAGE_BASE_URL (the /media route).
+    STORAGE_BACKEND: Literal["imagekit", "local"] = "imagekit"
+    LOCAL_STORAGE_DIR: str = "media"
+    LOCAL_STORAGE_BASE_URL: str = "/api/v1/media"
+
+    # Widths of the responsive variants precomputed for post images
+    IMAGE_VARIANT_WIDTHS: List[int] = [320, 640, 960, 1280, 1920]
+
+    # Storage HTTP client
+    STORAGE_MAX_CONNECTIONS: int = 20
+    STORAGE_CONNECT_TIMEOUT: float = 5.0
+    STORAGE_TIMEOUT: float = 30.0
+    STORAGE_UPLOAD_TIMEOUT: float = 300.0
+    STORAGE_MAX_RETRIES: int = 3
+    STORAGE_RETRY_BACKOFF: float = 0.5
+
+    # Uploads (sizes in bytes)
+    MAX_IMAGE_UPLOAD_SIZE: int = 20 * 1024 * 1024
+    MAX_VIDEO_UPLOAD_SIZE: int = 500 * 1024 * 1024
+    MAX_FILE_UPLOAD_SIZE: int = 100 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MAX_BATCH_UPLOAD_SIZE: int = 500 * 1024 * 1024  # whole request
+    UPLOAD_BATCH_MAX_FILES: int = 50
+    UPLOAD_BATCH_CONCURRENCY: int = 8
+
+    # Background upload jobs
+    UPLOAD_SPOOL_DIR: str = os.path.join(tempfile.gettempdir(), "atlania-uploads")
+    UPLOAD_JOB_WORKERS: int = 4
+    UPLOAD_JOB_QUEUE_SIZE: int = 1000
+    UPLOAD_JOB_MAX_ATTEMPTS: int = 3
+
+    # Resumable upload sessions
+    UPLOAD_SESSION_TTL: int = 24 * 60 * 60  # seconds since the last chunk
+    UPLOAD_SESSION_MAX_CHUNK_SIZE: int = 64 * 1024 * 1024
+    UPLOAD_SESSION_GC_INTERVAL: int = 10 * 60  # seconds
+    
+    # Production server (app/server.py). WEB_CONCURRENCY defaults to one
+    # worker per CPU; PORT matches what most PaaS hosts inject.
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: Optional[int] = None
+    SERVER_PRELOAD: bool = True
+    SERVER_MAX_REQUESTS: int = 10000  # recycle a worker after this many requests (0 = never)
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # seconds to drain in-flight requests on SIGTERM
+    SERVER_TIMEOUT: int = 60  # seconds before a silent worker is restarted
+    SERVER_KEEPALIVE: int = 5
+
+    # Readiness probe (/health/ready). Checks run in the background every
+    # interval; probes serve the cached report unless it is older than the TTL.
+    HEALTH_CHECK_INTERVAL: float = 5.0
+    HEALTH_CHECK_TTL: float = 15.0
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+    HEALTH_POOL_SATURATION: float = 0.9  # share of pool connections checked out
+
+    # Startup warmup (readiness waits for it) and the caches it fills.
+    # Caches are per process; the TTLs bound staleness across workers.
+    WARMUP_ENABLED: bool = True
+    WARMUP_POOL_CONNECTIONS: int = 2
+    WARMUP_HOT_POSTS: int = 50  # newest published posts rendered into the post cache
+    CATEGORY_CACHE_TTL: float = 5 * 60.0
+    CATEGORY_STATS_CACHE_TTL: float = 60.0  # post counts and latest posts
+    POST_CACHE_SIZE: int = 1000  # entries; 0 disables the post cache
+    POST_CACHE_TTL: float = 30.0
+
+    # Trending posts: likes and comments weighted and halved every half-life,
+    # folded into post_trending_scores by a background job
+    TRENDING_LIKE_WEIGHT: float = 1.0
+    TRENDING_COMMENT_WEIGHT: float = 2.0
+    TRENDING_HALF_LIFE_HOURS: float = 24.0
+    TRENDING_REFRESH_INTERVAL: float = 60.0  # seconds (0 disables the job)
+    TRENDING_BATCH_SIZE: int = 5000  # interactions per source per transaction
+    TRENDING_GRACE_SECONDS: float = 60.0  # interactions are folded in once this old
+    TRENDING_MIN_SCORE: float = 0.01  # scores that decay below this are dropped
+
+    # Related posts: each post's best neighbors by co-likes, title/excerpt
+    # terms and category, rebuilt in the background into post_related
+    RELATED_POSTS: int = 10  # neighbors stored per post
+    RELATED_COLIKE_WEIGHT: float = 3.0
+    RELATED_TERM_WEIGHT: float = 2.0
+    RELATED_CATEGORY_WEIGHT: float = 1.0
+    RELATED_MAX_TERM_POSTS: int = 200  # terms in more posts are ignored
+    RELATED_REFRESH_INTERVAL: float = 30.0  # seconds (0 disables the job)
+    RELATED_BATCH_SIZE: int = 100  # posts per transaction
+    RELATED_SWEEP_BATCH: int = 500  # stale posts rebuilt per cycle
+    RELATED_MAX_AGE_HOURS: float = 24.0
+
+    # Post view counter: views are buffered per worker and upserted into
+    # post_views in batches; a crash loses up to one interval of views
+    VIEW_FLUSH_INTERVAL: float = 10.0  # seconds
+    VIEW_BUFFER_MAX_POSTS: int = 10000  # distinct posts buffered per worker
+
+    # Slow-query log: statements slower than the threshold (0 disables) are
+    # logged as JSON lines; plans of slow SELECTs are captured in the background
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_LOG_PARAMS: bool = False  # values include emails and password hashes
+    SLOW_QUERY_LOG_FILE: Optional[str] = None
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = False  # PostgreSQL; re-runs the SELECT
+    SLOW_QUERY_EXPLAIN_INTERVAL: int = 60 * 60  # seconds between plans per statement shape
+
+    # Per-request profiling: requests with an admin-issued X-Profile-Token
+    # header, plus a random PROFILE_SAMPLE_RATE share of all requests
+    PROFILING_ENABLED: bool = True
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL: float = 0.005  # seconds between stack samples
+    PROFILE_DIR: str = os.path.join(tempfile.gettempdir(), "atlania-profiles")
+    PROFILE_MAX_FILES: int = 100  # oldest profiles are deleted beyond this
+    PROFILE_MAX_CONCURRENT: int = 1  # per process
+    PROFILE_TOKEN_EXPIRE_SECONDS: int = 10 * 60
+
+    # Serialize post, interaction and admin responses straight to JSON bytes
+    # in the handler instead of through FastAPI's response_model encoding
+    FAST_JSON_RESPONSES: bool = True
+
+    # Serve Prometheus metrics at /metrics (set PROMETHEUS_MULTIPROC_DIR
+    # in the environment to aggregate across worker processes)
+    METRICS_ENABLED: bool = True
     
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
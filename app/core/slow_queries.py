@@ -0,0 +1,195 @@
+"""
+Slow-query log.
+
+The cursor hooks in ``app.core.database`` call ``record`` for every
+statement slower than ``SLOW_QUERY_THRESHOLD_MS``. Each one is logged as a
+JSON line with its route, duration and normalized SQL to the
+``atlania.slow_queries`` logger (and ``SLOW_QUERY_LOG_FILE`` if set). Bound
+parameters are only added with ``SLOW_QUERY_LOG_PARAMS``, since they carry
+user data such as emails and password hashes.
+
+The first slow SELECT of each statement shape in every
+``SLOW_QUERY_EXPLAIN_INTERVAL`` also has its query plan captured and
+logged. Plans are taken by a background thread on its own connection, so
+the request that ran the slow query does not wait for them.
+"""
+import hashlib
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Optional
+from sqlalchemy.engine import Engine
+from app.core.request_context import current_scope, route_template
+from app.core.settings import settings
+
+logger = logging.getLogger("atlania.slow_queries")
+
+# Execution option that keeps a connection's statements out of the log
+SKIP_OPTION = "skip_slow_query_log"
+
+MAX_PARAMETER_LENGTH = 200
+EXPLAIN_QUEUE_SIZE = 100
+# Statement shapes remembered for EXPLAIN rate limiting
+MAX_EXPLAINED = 1000
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN (FORMAT JSON) ",
+    "mysql": "EXPLAIN ",
+}
+
+_explain_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+_explained: "OrderedDict[str, float]" = OrderedDict()
+_explained_lock = threading.Lock()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+_file_handler: Optional[logging.Handler] = None
+
+
+def normalize(statement: str) -> str:
+    """
+    Reduce a statement to its shape: literals become ``?``, IN lists become
+    ``(...)`` and whitespace is collapsed, so repeats of a query group together.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    return _IN_LIST.sub("(...)", normalized)
+
+
+def record(
+    engine: Engine,
+    statement: str,
+    parameters: Any,
+    duration: float,
+    executemany: bool,
+) -> None:
+    """
+    Log a slow statement and schedule a plan capture for it.
+
+    Args:
+        engine: Engine the statement ran on
+        statement: SQL as sent to the driver
+        parameters: Bound parameters
+        duration: Execution time in seconds
+        executemany: Whether the statement ran once per parameter set
+    """
+    normalized = normalize(statement)
+    fingerprint = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    scope = current_scope.get()
+    entry = {
+        "event": "slow_query",
+        "at": datetime.now(timezone.utc).isoformat(),
+        "fingerprint": fingerprint,
+        "duration_ms": round(duration * 1000, 2),
+        "method": scope.get("method") if scope else None,
+        "route": route_template(scope) if scope else None,
+        "statement": normalized,
+        "executemany": executemany,
+    }
+    if settings.SLOW_QUERY_LOG_PARAMS:
+        entry["parameters"] = _truncate(parameters)
+    _emit(entry)
+
+    if settings.SLOW_QUERY_EXPLAIN and not executemany and _should_explain(engine, statement, fingerprint):
+        try:
+            _explain_queue.put_nowait({
+                "engine": engine,
+                "statement": statement,
+                "parameters": parameters,
+                "fingerprint": fingerprint,
+                "normalized": normalized,
+            })
+        except queue.Full:
+            pass  # plans are best effort
+        else:
+            _ensure_worker()
+
+
+def _emit(entry: Dict[str, Any]) -> None:
+    global _file_handler
+    if settings.SLOW_QUERY_LOG_FILE and _file_handler is None:
+        _file_handler = RotatingFileHandler(
+            settings.SLOW_QUERY_LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5
+        )
+        _file_handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(_file_handler)
+    logger.warning(json.dumps(entry, default=str))
+
+
+def _truncate(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: _truncate(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_truncate(value) for value in parameters]
+    if isinstance(parameters, (str, bytes)) and len(parameters) > MAX_PARAMETER_LENGTH:
+        return f"{parameters[:MAX_PARAMETER_LENGTH]!r}... ({len(parameters)} long)"
+    return parameters
+
+
+def _should_explain(engine: Engine, statement: str, fingerprint: str) -> bool:
+    if engine.dialect.name not in EXPLAIN_PREFIXES:
+        return False
+    # Plans are only taken for reads; EXPLAIN ANALYZE runs the statement
+    if statement.lstrip()[:6].upper() != "SELECT":
+        return False
+    now = time.monotonic()
+    with _explained_lock:
+        last = _explained.get(fingerprint)
+        if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL:
+            return False
+        _explained[fingerprint] = now
+        _explained.move_to_end(fingerprint)
+        while len(_explained) > MAX_EXPLAINED:
+            _explained.popitem(last=False)
+    return True
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_explain_loop, name="slow-query-explain", daemon=True)
+            _worker.start()
+
+
+def _explain_loop() -> None:
+    while True:
+        job = _explain_queue.get()
+        try:
+            _emit({
+                "event": "query_plan",
+                "at": datetime.now(timezone.utc).isoformat(),
+                "fingerprint": job["fingerprint"],
+                "statement": job["normalized"],
+                "plan": _explain(job["engine"], job["statement"], job["parameters"]),
+            })
+        except Exception:
+            logger.exception("Could not capture the plan for query %s", job["fingerprint"])
+
+
+def _explain(engine: Engine, statement: str, parameters: Any) -> Any:
+    prefix = EXPLAIN_PREFIXES[engine.dialect.name]
+    if engine.dialect.name == "postgresql" and settings.SLOW_QUERY_EXPLAIN_ANALYZE:
+        prefix = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+    with engine.connect() as connection:
+        connection = connection.execution_options(**{SKIP_OPTION: True})
+        result = connection.exec_driver_sql(prefix + statement, parameters or ())
+        rows = [list(row) for row in result]
+        # Never commit: EXPLAIN ANALYZE really runs the statement
+        connection.rollback()
+    if engine.dialect.name == "postgresql":
+        return rows[0][0]
+    return rows
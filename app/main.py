@@ -1,18 +1,65 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from app.core.settings import settings
+from app.core import metrics
+from app.core.middleware import (
+    BodySizeLimitMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    RequestContextMiddleware,
+)
+from app.core.database import dispose_engine
 
 from app.api.v1.api import api_router
+from app.services import health, related, storage, trending, upload_jobs, upload_sessions, view_counter, warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    upload_jobs.start()
+    upload_sessions.start()
+    view_counter.start()
+    trending.start()
+    related.start()
+    warmup.start()
+    health.start()
+    yield
+    await health.shutdown()
+    await warmup.shutdown()
+    await related.shutdown()
+    await trending.shutdown()
+    await view_counter.shutdown()
+    await upload_sessions.shutdown()
+    await upload_jobs.shutdown()
+    # Release pooled keep-alive connections to the storage backend
+    await storage.close()
+    dispose_engine()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Add session middleware (required for OAuth)
 app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
 
+# Cut oversized uploads off while the body is still streaming in
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        f"{settings.API_V1_STR}/upload/image": settings.MAX_IMAGE_UPLOAD_SIZE,
+        f"{settings.API_V1_STR}/upload/video": settings.MAX_VIDEO_UPLOAD_SIZE,
+        f"{settings.API_V1_STR}/upload/batch": settings.MAX_BATCH_UPLOAD_SIZE,
+        f"{settings.API_V1_STR}/upload/sessions": settings.UPLOAD_SESSION_MAX_CHUNK_SIZE,
+        f"{settings.API_V1_STR}/upload": settings.MAX_FILE_UPLOAD_SIZE,
+    },
+)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 # Set all CORS enabled origins
@@ -25,6 +72,16 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Lets DB hooks attribute slow queries to the route that ran them
+app.add_middleware(RequestContextMiddleware)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, sample_rate=settings.PROFILE_SAMPLE_RATE)
+
+# Outermost, so latency covers every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 @app.get("/")
 def root():
     return {"message": "Hello World"}
@@ -32,3 +89,27 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/live")
+def liveness():
+    """
+    Liveness probe: the process is serving requests. Checks no dependencies.
+    """
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe: database, connection pool and storage backend.
+
+    Serves the report cached by the background checker, so frequent probes
+    add no load. Returns 503 when any check fails.
+    """
+    report = await health.get_report()
+    return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics():
+        body, content_type = metrics.render()
+        return Response(content=body, media_type=content_type)
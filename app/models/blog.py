@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Table, Enum
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Table, Enum, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -62,6 +62,7 @@ class Post(Base):
     excerpt = Column(Text)
     content = Column(Text)
     image = Column(String)
+    image_variants = Column(JSON)  # {width: url}, built when the image is set
     read_time = Column(String)
     featured = Column(Boolean, default=False)
     published = Column(Boolean, default=True) # Keeping for legacy, will transition to status
@@ -80,6 +81,11 @@ class Post(Base):
     comments = relationship("Comment", back_populates="post")
     likes = relationship("Like", back_populates="post")
 
+    __table_args__ = (
+        # Keyset scans of one status (e.g. the moderation queue)
+        Index("ix_posts_status_id", "status", "id"),
+    )
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -105,3 +111,9 @@ class Like(Base):
     # Relationships
     user = relationship("User", back_populates="likes")
     post = relationship("Post", back_populates="likes")
+
+    __table_args__ = (
+        # Per-post like counts, and the user -> post self-join behind co-like counts
+        Index("ix_likes_post_id_user_id", "post_id", "user_id"),
+        Index("ix_likes_user_id_post_id", "user_id", "post_id"),
+    )
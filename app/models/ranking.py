@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class PostTrendingScore(Base):
+    """
+    Time-decayed interaction score of a post, maintained by ``app.services.trending``.
+
+    ``rank`` is log2 of the post's score projected to a fixed epoch, so
+    ordering by it is ordering by current score and rows only change when
+    their post gets new interactions.
+    """
+    __tablename__ = "post_trending_scores"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Float, nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class RankingWatermark(Base):
+    """Highest source row ID a ranking job has folded in, per source table."""
+    __tablename__ = "ranking_watermarks"
+
+    source = Column(String(32), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+
+class PostRelated(Base):
+    """Precomputed related-post neighbors, maintained by ``app.services.related``."""
+    __tablename__ = "post_related"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    related_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # Serving: one post's neighbors, best first
+        Index("ix_post_related_post_id_score", "post_id", "score"),
+    )
+
+class PostRelatedBuild(Base):
+    """When a post's related list was last computed."""
+    __tablename__ = "post_related_builds"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    built_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+class PostView(Base):
+    """View count of a post, flushed in batches by ``app.services.view_counter``."""
+    __tablename__ = "post_views"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    views = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
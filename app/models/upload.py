@@ -0,0 +1,71 @@
+import enum
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class UploadJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class UploadJob(Base):
+    """Background transfer of a spooled upload to the storage backend."""
+    __tablename__ = "upload_jobs"
+
+    id = Column(String(32), primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    file_name = Column(String, nullable=False)
+    status = Column(Enum(UploadJobStatus), default=UploadJobStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    result = Column(Text)  # JSON-encoded FileUploadResponse once succeeded
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class Upload(Base):
+    """
+    A user's reference to a stored file, keyed by content hash.
+    
+    Identical content is stored once; each owner gets their own row pointing
+    at the shared storage file_id, so the number of rows per file_id is the
+    file's reference count.
+    """
+    __tablename__ = "uploads"
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    sha256 = Column(String(64), index=True, nullable=False)
+    file_id = Column(String, index=True, nullable=False)
+    name = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    thumbnail_url = Column(String)
+    file_type = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    width = Column(Integer)
+    height = Column(Integer)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("owner_id", "sha256", name="uq_uploads_owner_sha256"),
+    )
+
+class UploadSession(Base):
+    """
+    A resumable upload in progress.
+    
+    Chunks are appended to a spool file on the accepting host; ``received``
+    is the committed byte offset, i.e. where the next chunk must start.
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
+    file_name = Column(String, nullable=False)
+    content_type = Column(String, nullable=False)
+    folder = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    received = Column(BigInteger, default=0, nullable=False)
+    expires_at = Column(DateTime(timezone=True), index=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
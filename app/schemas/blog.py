@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, AnyHttpUrl
-from typing import List, Optional
+from pydantic import BaseModel, EmailStr, AnyHttpUrl, Field
+from typing import Dict, List, Optional
 from datetime import datetime
 from app.models.blog import UserRole, PostStatus
 
@@ -15,14 +15,27 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
 
-# Properties to return via API
-class User(UserBase):
+# Properties to return via API. A read-only model, deliberately not derived
+# from UserBase: the email was validated as EmailStr when it was stored, and
+# re-checking it (DNS-style domain parsing) for every nested author dominated
+# response serialization.
+class User(BaseModel):
+    email: str = Field(..., json_schema_extra={"format": "email"})
+    full_name: Optional[str] = None
+    avatar: Optional[str] = None
+    is_active: Optional[bool] = True
+    role: Optional[UserRole] = UserRole.READER
     id: int
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class UserPage(BaseModel):
+    """Keyset-paginated page of users"""
+    items: List[User]
+    next_cursor: Optional[int] = None
+
 # Category Schemas
 class CategoryBase(BaseModel):
     name: str
@@ -66,6 +79,16 @@ class Like(LikeBase):
     class Config:
         from_attributes = True
 
+# Bookmark Schemas
+class BookmarkState(BaseModel):
+    """Whether the current user has bookmarked a post"""
+    post_id: int
+    bookmarked: bool
+
+class BookmarkCheck(BaseModel):
+    """IDs, among those asked about, of the posts the current user bookmarked"""
+    bookmarked: List[int]
+
 # Post Schemas
 class PostBase(BaseModel):
     title: str
@@ -92,10 +115,55 @@ class Post(PostBase):
     category: Optional[Category] = None
     comments: List[Comment] = []
     likes_count: int = 0
+    views: int = 0
+    image_variants: Optional[Dict[int, str]] = None
 
     class Config:
         from_attributes = True
 
+class PostSummary(BaseModel):
+    """Lightweight post row for listings (no content, comments or likes)"""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    image: Optional[str] = None
+    image_variants: Optional[Dict[int, str]] = None
+    status: Optional[PostStatus] = None
+    author_id: Optional[int] = None
+    category_id: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class TrendingPost(PostSummary):
+    """Post summary with its current time-decayed interaction score"""
+    score: float
+
+class RelatedPost(PostSummary):
+    """Post summary with its similarity to the post it is related to"""
+    score: float
+
+class CategoryWithStats(Category):
+    """Category with its number of published posts and the newest one"""
+    post_count: int = 0
+    latest_post: Optional[PostSummary] = None
+
+class PostSummaryPage(BaseModel):
+    """Keyset-paginated page of post summaries"""
+    items: List[PostSummary]
+    next_cursor: Optional[int] = None
+
+class PostStatusBulkUpdate(BaseModel):
+    """Schema for moderating many posts at once"""
+    ids: List[int] = Field(..., min_length=1, max_length=5000)
+    status: PostStatus
+
+class PostStatusBulkResult(BaseModel):
+    """Result of a bulk moderation request"""
+    updated: int
+
 # Authentication Schemas
 class UserLogin(BaseModel):
     """Schema for user login request"""
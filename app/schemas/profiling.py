@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class ProfileToken(BaseModel):
+    """Token that enables profiling of requests sending it in ``header``"""
+    token: str
+    header: str = "X-Profile-Token"
+    expires_in: int
+
+class ProfileInfo(BaseModel):
+    """Metadata of a stored request profile"""
+    id: str
+    created_at: datetime
+    method: str
+    path: str
+    route: Optional[str] = None
+    status_code: int
+    duration_ms: float
+    samples: int
+    interval_ms: float
+    trigger: str
@@ -1,5 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from datetime import datetime
 from typing import Optional, List
+from app.models.upload import UploadJobStatus
 
 class FileUploadResponse(BaseModel):
     file_id: str
@@ -14,3 +16,35 @@ class FileUploadResponse(BaseModel):
 class FileDeleteResponse(BaseModel):
     success: bool
     message: str
+
+class UploadJobResponse(BaseModel):
+    job_id: str
+    status: UploadJobStatus
+    attempts: int = 0
+    result: Optional[FileUploadResponse] = None
+    error: Optional[str] = None
+
+class BatchUploadItem(BaseModel):
+    index: int
+    file_name: Optional[str] = None
+    status_code: int
+    result: Optional[FileUploadResponse] = None
+    error: Optional[str] = None
+
+class BatchUploadResponse(BaseModel):
+    items: List[BatchUploadItem]
+    succeeded: int
+    failed: int
+
+class UploadSessionCreate(BaseModel):
+    file_name: str
+    content_type: str
+    size: int = Field(..., gt=0)
+    folder: str = "videos"
+
+class UploadSessionResponse(BaseModel):
+    session_id: str
+    file_name: str
+    size: int
+    offset: int
+    expires_at: datetime
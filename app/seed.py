@@ -1,8 +1,17 @@
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal, Base
 from app.models.blog import User, Category, Post
 from app.core.settings import settings
 
+DEFAULT_CATEGORIES = [
+    {"name": "Technologies", "slug": "technologies"},
+    {"name": "Digital marketing", "slug": "digital-marketing"},
+    {"name": "Business", "slug": "business"},
+    {"name": "Blockchain", "slug": "blockchain"},
+    {"name": "Android Dev", "slug": "android-dev"},
+    {"name": "Gadget", "slug": "gadget"}
+]
+
 def seed():
     db = SessionLocal()
     
@@ -13,17 +22,8 @@ def seed():
         return
 
     # 1. Create Categories
-    categories_data = [
-        {"name": "Technologies", "slug": "technologies"},
-        {"name": "Digital marketing", "slug": "digital-marketing"},
-        {"name": "Business", "slug": "business"},
-        {"name": "Blockchain", "slug": "blockchain"},
-        {"name": "Android Dev", "slug": "android-dev"},
-        {"name": "Gadget", "slug": "gadget"}
-    ]
-    
     db_categories = []
-    for cat in categories_data:
+    for cat in DEFAULT_CATEGORIES:
         db_cat = Category(**cat)
         db.add(db_cat)
         db_categories.append(db_cat)
@@ -0,0 +1,149 @@
+"""
+Production server: gunicorn supervising uvicorn workers.
+
+    python -m app.server
+    python -m app.server --app benchmarks.asgi:app
+
+Configured from ``Settings``. Workers default to one per CPU (override with
+``WEB_CONCURRENCY``). With ``SERVER_PRELOAD`` the app is imported once in
+the master before forking, so workers share its memory copy-on-write; the
+DB engine and HTTP clients are created lazily, so no connections are
+inherited across the fork. Each worker is recycled after
+``SERVER_MAX_REQUESTS`` requests plus up to ``SERVER_MAX_REQUESTS_JITTER``,
+which staggers restarts.
+
+Signals (send them to the master process):
+    TERM   Stop accepting connections, let in-flight requests finish for up
+           to ``SERVER_GRACEFUL_TIMEOUT`` seconds, run lifespan shutdown and exit.
+    HUP    Start a new generation of workers and drain the old ones. The
+           app is preloaded, so restart the master to deploy new code.
+    TTIN   Add a worker. TTOU removes one.
+
+With more than one worker, Prometheus metrics switch to multi-process
+mode: ``PROMETHEUS_MULTIPROC_DIR`` is cleared (or created in the temp
+directory when unset) before the app is imported.
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.util import import_app
+from uvicorn_worker import UvicornWorker
+
+from app.core.settings import settings
+
+# Time left after draining requests for lifespan shutdown to run before the
+# master kills the worker.
+SHUTDOWN_MARGIN = 5
+
+
+class Worker(UvicornWorker):
+    """Uvicorn worker that stops draining connections within the graceful timeout."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = max(
+            self.cfg.graceful_timeout - SHUTDOWN_MARGIN, 1
+        )
+
+
+class Server(BaseApplication):
+    """Gunicorn application that loads an ASGI app from an import path."""
+
+    def __init__(self, app_path: str, options: Dict[str, Any]):
+        self.app_path = app_path
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        return import_app(self.app_path)
+
+
+def worker_count() -> int:
+    """
+    Number of workers to run: ``WEB_CONCURRENCY`` or one per CPU.
+    """
+    return settings.WEB_CONCURRENCY or multiprocessing.cpu_count()
+
+
+def prepare_metrics_dir(workers: int) -> Optional[str]:
+    """
+    Set up ``PROMETHEUS_MULTIPROC_DIR`` for a multi-worker run.
+
+    Must run before the app is imported. Leftover files from a previous run
+    are removed, since their samples would otherwise be added to this run's
+    totals.
+
+    Returns:
+        The directory when it was created here (and should be removed on
+        exit), otherwise None
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(".db"):
+                os.remove(os.path.join(directory, name))
+        return None
+    if workers > 1:
+        directory = tempfile.mkdtemp(prefix="atlania-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+        return directory
+    return None
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    # Only reached if something used the DB while the app was preloading
+    from app.core.database import dispose_engine
+    dispose_engine(close=False)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    from app.core.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
+
+
+def build_options(workers: int, metrics_dir: Optional[str]) -> Dict[str, Any]:
+    """
+    Gunicorn settings derived from ``Settings``.
+    """
+    def on_exit(server: Any) -> None:
+        if metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": workers,
+        "worker_class": Worker,
+        "preload_app": settings.SERVER_PRELOAD,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+        "timeout": settings.SERVER_TIMEOUT,
+        "keepalive": settings.SERVER_KEEPALIVE,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+        "on_exit": on_exit,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the Atlania API in production.")
+    parser.add_argument("--app", default="app.main:app", help="ASGI app import path")
+    args = parser.parse_args(argv)
+
+    workers = worker_count()
+    metrics_dir = prepare_metrics_dir(workers)
+    Server(args.app, build_options(workers, metrics_dir)).run()
+
+
+if __name__ == "__main__":
+    main()
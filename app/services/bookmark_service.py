@@ -0,0 +1,112 @@
+from typing import Any, Iterable, List, Optional, Set
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.blog import Post, PostStatus, bookmarks
+from app.services.post_service import SUMMARY_COLUMNS
+
+
+def _insert_ignoring_duplicates(db: Session) -> Any:
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(bookmarks).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(bookmarks).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        return insert(bookmarks).prefix_with("IGNORE")
+    return insert(bookmarks)
+
+
+def add_bookmark(db: Session, user_id: int, post_id: int) -> bool:
+    """
+    Bookmark a published post. Bookmarking it again is a no-op.
+
+    The row is written by one ``INSERT ... SELECT`` that only yields a row
+    when the post is published and skips duplicates, so concurrent requests
+    cannot race into a unique-key error.
+
+    Args:
+        db: Database session
+        user_id: ID of the user bookmarking
+        post_id: ID of the post
+
+    Returns:
+        False if the post does not exist or is not published
+    """
+    published = select(literal(user_id), Post.id).where(
+        Post.id == post_id, Post.status == PostStatus.PUBLISHED
+    )
+    statement = (
+        _insert_ignoring_duplicates(db)
+        .from_select([bookmarks.c.user_id, bookmarks.c.post_id], published)
+    )
+    try:
+        inserted = db.execute(statement).rowcount
+        db.commit()
+    except IntegrityError:
+        # Duplicate on dialects without an insert-ignore form
+        db.rollback()
+        return True
+    if inserted:
+        return True
+    # Nothing inserted: either it was already bookmarked or the post is not there
+    return db.query(Post.id).filter(
+        Post.id == post_id, Post.status == PostStatus.PUBLISHED
+    ).first() is not None
+
+
+def remove_bookmark(db: Session, user_id: int, post_id: int) -> None:
+    """
+    Remove a bookmark with a single DELETE; removing a missing one is a no-op.
+    """
+    db.execute(
+        delete(bookmarks).where(bookmarks.c.user_id == user_id, bookmarks.c.post_id == post_id)
+    )
+    db.commit()
+
+
+def get_bookmarks_page(
+    db: Session,
+    user_id: int,
+    limit: int = 20,
+    before_id: Optional[int] = None,
+) -> List[Any]:
+    """
+    Get one keyset-paginated page of a user's bookmarked published posts.
+
+    Reads summary columns through the bookmarks primary key instead of
+    loading ``User.bookmarked_posts``.
+
+    Args:
+        db: Database session
+        user_id: ID of the user
+        limit: Maximum number of rows to return
+        before_id: Only return posts with an ID lower than this cursor
+
+    Returns:
+        Summary rows in descending post ID order (newest posts first)
+    """
+    query = (
+        db.query(*SUMMARY_COLUMNS)
+        .join(bookmarks, bookmarks.c.post_id == Post.id)
+        .filter(bookmarks.c.user_id == user_id, Post.status == PostStatus.PUBLISHED)
+    )
+    if before_id is not None:
+        query = query.filter(bookmarks.c.post_id < before_id)
+    return query.order_by(bookmarks.c.post_id.desc()).limit(limit).all()
+
+
+def get_bookmarked_ids(db: Session, user_id: int, post_ids: Iterable[int]) -> Set[int]:
+    """
+    Find which of the given posts a user has bookmarked, in one query.
+    """
+    ids = set(post_ids)
+    if not ids:
+        return set()
+    rows = db.execute(
+        select(bookmarks.c.post_id).where(
+            bookmarks.c.user_id == user_id, bookmarks.c.post_id.in_(ids)
+        )
+    )
+    return {post_id for post_id, in rows}
@@ -0,0 +1,122 @@
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.metrics import record_cache
+from app.core.settings import settings
+from app.models.blog import Category, Post, PostStatus
+from app.schemas.blog import Category as CategorySchema, CategoryWithStats
+from app.services.post_service import SUMMARY_COLUMNS
+
+# Categories are only created by seeding or migrations, so each process
+# keeps the list for CATEGORY_CACHE_TTL seconds. Their stats change whenever
+# a post is published or unpublished: moderation in this process drops them,
+# and CATEGORY_STATS_CACHE_TTL bounds staleness from other processes.
+_categories: Optional[List[CategorySchema]] = None
+_loaded_at = 0.0
+_stats: Optional[List[CategoryWithStats]] = None
+_stats_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def get_categories(db: Session) -> List[CategorySchema]:
+    """
+    Get every category, from the cache when it is fresh.
+
+    Args:
+        db: Database session, used on a cache miss
+
+    Returns:
+        Validated category schemas
+    """
+    categories = _categories
+    hit = categories is not None and time.monotonic() - _loaded_at < settings.CATEGORY_CACHE_TTL
+    record_cache("categories", hit)
+    return categories if hit else load(db)
+
+
+def get_categories_with_stats(db: Session) -> List[CategoryWithStats]:
+    """
+    Get every category with its published post count and newest published
+    post, from the cache when it is fresh.
+
+    Args:
+        db: Database session, used on a cache miss
+
+    Returns:
+        Validated category schemas with stats
+    """
+    stats = _stats
+    hit = stats is not None and time.monotonic() - _stats_loaded_at < settings.CATEGORY_STATS_CACHE_TTL
+    record_cache("category_stats", hit)
+    return stats if hit else load_stats(db)
+
+
+def load(db: Session) -> List[CategorySchema]:
+    """
+    Read every category from the database into the cache.
+    """
+    global _categories, _loaded_at
+    categories = [CategorySchema.model_validate(c) for c in db.query(Category).order_by(Category.id)]
+    with _lock:
+        _categories = categories
+        _loaded_at = time.monotonic()
+    return categories
+
+
+def load_stats(db: Session) -> List[CategoryWithStats]:
+    """
+    Read every category's stats into the cache with one grouped query.
+    """
+    global _stats, _stats_loaded_at
+    # IDs grow with creation time, so the highest published ID is the newest post
+    published = (
+        db.query(
+            Post.category_id.label("category_id"),
+            func.count(Post.id).label("post_count"),
+            func.max(Post.id).label("latest_id"),
+        )
+        .filter(Post.status == PostStatus.PUBLISHED)
+        .group_by(Post.category_id)
+        .subquery()
+    )
+    rows = (
+        db.query(Category, published.c.post_count, *SUMMARY_COLUMNS)
+        .outerjoin(published, published.c.category_id == Category.id)
+        .outerjoin(Post, Post.id == published.c.latest_id)
+        .order_by(Category.id)
+    )
+    stats = []
+    for category, post_count, *summary in rows:
+        latest = dict(zip((column.key for column in SUMMARY_COLUMNS), summary))
+        stats.append(CategoryWithStats(
+            id=category.id,
+            name=category.name,
+            slug=category.slug,
+            post_count=post_count or 0,
+            latest_post=latest if latest["id"] is not None else None,
+        ))
+    with _lock:
+        _stats = stats
+        _stats_loaded_at = time.monotonic()
+    return stats
+
+
+def invalidate() -> None:
+    """
+    Drop the cached category list and stats.
+    """
+    global _categories, _stats
+    with _lock:
+        _categories = None
+        _stats = None
+
+
+def invalidate_stats() -> None:
+    """
+    Drop the cached category stats, e.g. after posts are published or unpublished.
+    """
+    global _stats
+    with _lock:
+        _stats = None
@@ -1,21 +1,35 @@
-from authlib.integrations.starlette_client import OAuth
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from app.core.settings import settings
-from typing import Optional, Dict, Any
 
-# Initialize OAuth
-oauth = OAuth()
+if TYPE_CHECKING:
+    from authlib.integrations.starlette_client import OAuth
 
-# Register Google OAuth client
-if settings.GOOGLE_CLIENT_ID and settings.GOOGLE_CLIENT_SECRET:
-    oauth.register(
-        name='google',
-        client_id=settings.GOOGLE_CLIENT_ID,
-        client_secret=settings.GOOGLE_CLIENT_SECRET,
-        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-        client_kwargs={
-            'scope': 'openid email profile'
-        }
-    )
+# Authlib (and the HTTP stack it pulls in) is imported on first use; most
+# processes importing the app never start an OAuth flow.
+_oauth: Optional["OAuth"] = None
+
+
+def get_oauth() -> "OAuth":
+    """
+    Get the OAuth registry, registering the Google client on first use.
+    """
+    global _oauth
+    if _oauth is None:
+        from authlib.integrations.starlette_client import OAuth
+
+        oauth = OAuth()
+        if settings.GOOGLE_CLIENT_ID and settings.GOOGLE_CLIENT_SECRET:
+            oauth.register(
+                name='google',
+                client_id=settings.GOOGLE_CLIENT_ID,
+                client_secret=settings.GOOGLE_CLIENT_SECRET,
+                server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+                client_kwargs={
+                    'scope': 'openid email profile'
+                }
+            )
+        _oauth = oauth
+    return _oauth
 
 
 async def get_google_user_info(token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
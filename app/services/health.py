@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from app.core.database import get_engine
+from app.core.settings import settings
+from app.services import storage, warmup
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """Raised when nearly every pooled connection is checked out."""
+
+    def __init__(self, detail: Dict[str, Any]):
+        super().__init__(
+            f"{detail['checked_out']} of {detail['capacity']} connections checked out"
+        )
+        self.detail = detail
+
+
+# Last readiness report and when it was taken (monotonic seconds). Probes
+# read this; only the refresh loop (or a probe finding it stale) runs checks.
+_report: Optional[Dict[str, Any]] = None
+_checked_at = 0.0
+_refresh: Optional[asyncio.Future] = None
+_task: Optional[asyncio.Task] = None
+
+
+async def check_database() -> Dict[str, Any]:
+    """
+    Run ``SELECT 1`` on a pooled connection.
+    """
+    await run_in_threadpool(_select_one)
+    return {}
+
+
+async def check_pool() -> Dict[str, Any]:
+    """
+    Report how much of the connection pool is checked out.
+
+    Raises:
+        PoolSaturatedError: If the checked-out share reaches ``HEALTH_POOL_SATURATION``
+    """
+    pool = get_engine().pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    checked_out = pool.checkedout()
+    detail = {"checked_out": checked_out}
+    max_overflow = getattr(pool, "_max_overflow", -1)
+    if not hasattr(pool, "size") or max_overflow < 0:
+        return detail  # unbounded
+    capacity = pool.size() + max_overflow
+    detail["capacity"] = capacity
+    if capacity and checked_out / capacity >= settings.HEALTH_POOL_SATURATION:
+        raise PoolSaturatedError(detail)
+    return detail
+
+
+async def check_storage() -> Dict[str, Any]:
+    """
+    Check that the storage backend is reachable.
+    """
+    await storage.get_storage().ping()
+    return {"backend": settings.STORAGE_BACKEND}
+
+
+async def check_warmup() -> Dict[str, Any]:
+    """
+    Fail until startup warmup has finished.
+    """
+    if not warmup.is_done():
+        raise RuntimeError("warming up")
+    return {"steps": warmup.report()}
+
+
+CHECKS: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]] = {
+    "warmup": check_warmup,
+    "pool": check_pool,
+    "database": check_database,
+    "storage": check_storage,
+}
+
+
+async def refresh() -> Dict[str, Any]:
+    """
+    Run every check now and cache the report.
+
+    Returns:
+        Readiness report with per-check status and latency
+    """
+    global _report, _checked_at
+    # Pool first, so it is not counting the database check's own connection
+    checks = {"pool": await _run("pool", CHECKS["pool"])}
+    others = [name for name in CHECKS if name != "pool"]
+    results = await asyncio.gather(*(_run(name, CHECKS[name]) for name in others))
+    checks.update(zip(others, results))
+    ready = all(check["status"] == "ok" for check in checks.values())
+    _report = {
+        "status": "ready" if ready else "unavailable",
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "checks": checks,
+    }
+    _checked_at = time.monotonic()
+    return _report
+
+
+async def get_report() -> Dict[str, Any]:
+    """
+    Get the cached readiness report, refreshing it first if it is older
+    than ``HEALTH_CHECK_TTL``. Concurrent callers share one refresh.
+    """
+    global _refresh
+    if _report is not None and time.monotonic() - _checked_at < settings.HEALTH_CHECK_TTL:
+        # Don't keep reporting "warming up" until the next scheduled refresh
+        if _report["checks"]["warmup"]["status"] == "ok" or not warmup.is_done():
+            return _report
+    if _refresh is None or _refresh.done():
+        _refresh = asyncio.ensure_future(refresh())
+    return await asyncio.shield(_refresh)
+
+
+def start() -> None:
+    """
+    Start refreshing the report every ``HEALTH_CHECK_INTERVAL`` seconds.
+    """
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_refresh_loop())
+
+
+async def shutdown() -> None:
+    """
+    Stop the refresh task and drop the cached report.
+    """
+    global _task, _report
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+    _report = None
+
+
+def _select_one() -> None:
+    with get_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def _run(name: str, check: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        detail = await asyncio.wait_for(check(), timeout=settings.HEALTH_CHECK_TIMEOUT)
+        result = {"status": "ok", **detail}
+    except asyncio.TimeoutError:
+        result = {"status": "fail", "error": f"timed out after {settings.HEALTH_CHECK_TIMEOUT}s"}
+    except PoolSaturatedError as e:
+        result = {"status": "fail", "error": str(e), **e.detail}
+    except Exception as e:
+        result = {"status": "fail", "error": str(e) or type(e).__name__}
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    if result["status"] != "ok":
+        logger.warning("Readiness check %s failed: %s", name, result["error"])
+    return result
+
+
+async def _refresh_loop() -> None:
+    while True:
+        try:
+            await refresh()
+        except Exception:
+            logger.exception("Readiness refresh failed")
+        await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL)
@@ -1,66 +1,180 @@
 from imagekitio import ImageKit
 from app.core.settings import settings
-from typing import Optional, Dict, Any, List
+from app.core.metrics import record_cache
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, BinaryIO, Tuple
+import asyncio
+import logging
+import random
+import re
+import httpx
 import uuid
+from app.services.storage import StorageBackend, FileTooLargeError, LimitedReader
 
-# Initialize ImageKit client
-ik = ImageKit(
-    public_key=settings.IMAGEKIT_PUBLIC_KEY,
-    private_key=settings.IMAGEKIT_PRIVATE_KEY,
-    url_endpoint=settings.IMAGEKIT_URL_ENDPOINT
-)
+logger = logging.getLogger(__name__)
 
-def upload_file(
+# ImageKit SDK client, used for URL building only; it does no I/O. Created
+# on first use so installs on another storage backend need no ImageKit keys.
+_ik: Optional[ImageKit] = None
+
+
+def get_client() -> ImageKit:
+    """
+    Get the ImageKit SDK client, creating it on first use.
+    """
+    global _ik
+    if _ik is None:
+        _ik = ImageKit(
+            public_key=settings.IMAGEKIT_PUBLIC_KEY,
+            private_key=settings.IMAGEKIT_PRIVATE_KEY,
+            url_endpoint=settings.IMAGEKIT_URL_ENDPOINT
+        )
+    return _ik
+
+# Status codes worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Network calls go through one pooled async httpx client rather than the
+# blocking SDK. Besides keeping the event loop free, httpx streams file
+# objects in chunks where the SDK renders the whole multipart body in memory.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared storage HTTP client, creating it on first use.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            auth=(settings.IMAGEKIT_PRIVATE_KEY or "", ""),
+            timeout=httpx.Timeout(
+                settings.STORAGE_TIMEOUT, connect=settings.STORAGE_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.STORAGE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.STORAGE_MAX_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+async def close() -> None:
+    """
+    Close the shared HTTP client and its pooled connections.
+    """
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def _request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request with retries and exponential backoff.
+    
+    Connection errors, timeouts and retryable status codes are retried up
+    to ``STORAGE_MAX_RETRIES`` times. File bodies are rewound by httpx
+    before each attempt.
+    """
+    client = get_http_client()
+    attempt = 0
+    while True:
+        try:
+            response = await client.request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= settings.STORAGE_MAX_RETRIES:
+                return response
+            reason = f"HTTP {response.status_code}"
+        except httpx.TransportError as e:
+            if attempt >= settings.STORAGE_MAX_RETRIES:
+                raise
+            reason = repr(e)
+        delay = settings.STORAGE_RETRY_BACKOFF * (2 ** attempt) * (1 + random.random())
+        attempt += 1
+        logger.warning(
+            "ImageKit %s %s failed (%s); retry %d in %.2fs",
+            method, url, reason, attempt, delay
+        )
+        await asyncio.sleep(delay)
+
+async def upload_file(
     file: Any, 
     file_name: str, 
     folder: str = "general",
     tags: List[str] = None,
-    is_private_file: bool = False
+    is_private_file: bool = False,
+    max_size: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Upload a file to ImageKit.
     
+    File objects are streamed to ImageKit in ``UPLOAD_CHUNK_SIZE`` chunks
+    and never read into memory as a whole.
+    
     Args:
-        file: The file content (bytes, file-like object, or base64 string)
+        file: The file content (bytes, base64 string, or binary file-like object)
         file_name: The name to give the file in ImageKit
         folder: The folder to store the file in
         tags: List of tags to associate with the file
         is_private_file: Whether the file should be private
+        max_size: Optional size limit in bytes, enforced while streaming
         
     Returns:
         Dict containing upload results (url, fileId, name, etc.)
+    
+    Raises:
+        FileTooLargeError: If the stream exceeds ``max_size``
     """
     # Ensure unique filename
     unique_name = f"{uuid.uuid4()}-{file_name}"
     
-    upload_options = {
-        "file": file,
-        "file_name": unique_name,
-        "options": {
-            "folder": folder,
-            "tags": tags or [],
-            "is_private_file": is_private_file,
-            "use_unique_file_name": True
-        }
+    if hasattr(file, "read"):
+        file = LimitedReader(file, max_size=max_size)
+    
+    data = {
+        "fileName": unique_name,
+        "folder": folder,
+        "isPrivateFile": "true" if is_private_file else "false",
+        "useUniqueFileName": "true",
     }
+    if tags:
+        data["tags"] = ",".join(tags)
     
-    result = ik.upload(**upload_options)
+    response = await _request(
+        "POST",
+        f"{settings.IMAGEKIT_UPLOAD_BASE_URL}/api/v1/files/upload",
+        data=data,
+        files={"file": (unique_name, file)},
+        timeout=httpx.Timeout(
+            settings.STORAGE_UPLOAD_TIMEOUT, connect=settings.STORAGE_CONNECT_TIMEOUT
+        ),
+    )
     
-    if result.error:
-        raise Exception(f"ImageKit upload error: {result.error.message}")
-        
+    if response.status_code != 200:
+        raise Exception(f"ImageKit upload error: {_error_message(response)}")
+    
+    result = response.json()
     return {
-        "file_id": result.response.file_id,
-        "name": result.response.name,
-        "url": result.response.url,
-        "thumbnail_url": result.response.thumbnail_url,
-        "file_type": result.response.file_type,
-        "size": result.response.size,
-        "width": result.response.width,
-        "height": result.response.height,
+        "file_id": result["fileId"],
+        "name": result["name"],
+        "url": result["url"],
+        "thumbnail_url": result.get("thumbnailUrl"),
+        "file_type": result.get("fileType", "non-image"),
+        "size": result["size"],
+        "width": result.get("width"),
+        "height": result.get("height"),
     }
 
-def delete_file(file_id: str) -> bool:
+def _error_message(response: httpx.Response) -> str:
+    try:
+        return response.json().get("message", response.text)
+    except ValueError:
+        return response.text
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+async def delete_file(file_id: str) -> bool:
     """
     Delete a file from ImageKit.
     
@@ -70,32 +184,97 @@ def delete_file(file_id: str) -> bool:
     Returns:
         True if successful
     """
-    result = ik.delete_file(file_id)
+    response = await _request("DELETE", f"{settings.IMAGEKIT_API_BASE_URL}/v1/files/{file_id}")
     
-    if result.error:
-        raise Exception(f"ImageKit delete error: {result.error.message}")
+    if response.status_code not in (200, 204):
+        raise Exception(f"ImageKit delete error: {_error_message(response)}")
         
     return True
 
-def get_file_details(file_id: str) -> Dict[str, Any]:
+async def get_file_details(file_id: str) -> Dict[str, Any]:
     """
     Get details of a file from ImageKit.
     """
-    result = ik.get_file_details(file_id)
+    response = await _request("GET", f"{settings.IMAGEKIT_API_BASE_URL}/v1/files/{file_id}/details")
     
-    if result.error:
-        raise Exception(f"ImageKit details error: {result.error.message}")
+    if response.status_code != 200:
+        raise Exception(f"ImageKit details error: {_error_message(response)}")
         
-    return result.response.__dict__
+    return {_snake_case(key): value for key, value in response.json().items()}
+
+async def ping() -> None:
+    """
+    Make one cheap authenticated API call, without retries.
+
+    Raises:
+        Exception: If ImageKit is unreachable or rejects the credentials
+    """
+    response = await get_http_client().get(
+        f"{settings.IMAGEKIT_API_BASE_URL}/v1/files", params={"limit": 1}
+    )
+    if response.status_code != 200:
+        raise Exception(f"ImageKit ping error: {_error_message(response)}")
 
 def get_transformed_url(path: str, transformations: List[Dict[str, Any]]) -> str:
     """
     Generate a transformed URL for an image.
     
     Example transformations: [{"width": 100, "height": 100, "crop": "at_max"}]
+    
+    Results are memoized; the SDK takes tens of microseconds per URL and
+    listings build many of them for the same images.
     """
+    key = tuple(tuple(t.items()) for t in transformations)
+    hits = _build_url.cache_info().hits
+    url = _build_url(path, key)
+    record_cache("transformed_url", _build_url.cache_info().hits > hits)
+    return url
+
+@lru_cache(maxsize=4096)
+def _build_url(path: str, transformations: Tuple[Tuple[Tuple[str, Any], ...], ...]) -> str:
     options = {
         "path": path,
-        "transformation": transformations
+        "transformation": [dict(t) for t in transformations]
     }
-    return ik.url(options)
+    return get_client().url(options)
+
+
+class ImageKitStorage(StorageBackend):
+    """
+    Storage backend backed by ImageKit.
+    """
+
+    async def upload_file(
+        self,
+        file: Any,
+        file_name: str,
+        folder: str = "general",
+        tags: List[str] = None,
+        is_private_file: bool = False,
+        max_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        return await upload_file(file, file_name, folder, tags, is_private_file, max_size)
+
+    async def delete_file(self, file_id: str) -> bool:
+        return await delete_file(file_id)
+
+    async def get_file_details(self, file_id: str) -> Dict[str, Any]:
+        return await get_file_details(file_id)
+
+    def get_url(self, path: str, transformations: List[Dict[str, Any]] = None) -> str:
+        if not transformations:
+            return f"{settings.IMAGEKIT_URL_ENDPOINT.rstrip('/')}/{path.lstrip('/')}"
+        return get_transformed_url(path, transformations)
+
+    def get_variants(self, url: str, widths: List[int]) -> Optional[Dict[int, str]]:
+        endpoint = (settings.IMAGEKIT_URL_ENDPOINT or "").rstrip("/")
+        if not endpoint or not url.startswith(endpoint + "/"):
+            return None
+        path = url[len(endpoint):]
+        return {width: self.get_url(path, [{"width": width}]) for width in widths}
+
+    async def ping(self) -> None:
+        await ping()
+
+    async def close(self) -> None:
+        await close()
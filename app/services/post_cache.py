@@ -0,0 +1,90 @@
+"""
+Per-process cache of rendered ``GET /posts/{slug}`` responses.
+
+Only published posts are cached, as the JSON bytes sent to clients minus
+``views``, which changes on every read: ``with_views`` adds the current
+count when the body is served. Writes that change a post's rendering in
+this process (likes, comments, status changes) drop its entry; writes
+handled by other worker processes are picked up when the entry expires
+after ``POST_CACHE_TTL`` seconds.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from app.api.responses import dump_json
+from app.core.metrics import record_cache
+from app.core.settings import settings
+from app.schemas.blog import Post as PostSchema
+
+# slug -> (expires at, post id, body without views), least recently used first
+_entries: "OrderedDict[str, Tuple[float, int, bytes]]" = OrderedDict()
+# post id -> slug, so writes that only know the ID can invalidate
+_slugs: Dict[int, str] = {}
+_lock = threading.Lock()
+
+
+def render(post: Any) -> bytes:
+    """
+    Serialize a post for the cache: its response body without ``views``.
+    """
+    return dump_json(PostSchema, post, exclude={"views"})
+
+
+def with_views(body: bytes, views: int) -> bytes:
+    """
+    Complete a body from ``render`` with the post's view count.
+    """
+    return b'%s,"views":%d}' % (body[:-1], views)
+
+
+def get(slug: str) -> Optional[Tuple[int, bytes]]:
+    """
+    Get the post ID and cached response body of a post, or None on a miss.
+    """
+    with _lock:
+        entry = _entries.get(slug)
+        if entry is not None and entry[0] <= time.monotonic():
+            del _entries[slug]
+            entry = None
+        if entry is not None:
+            _entries.move_to_end(slug)
+    record_cache("post", entry is not None)
+    return entry[1:] if entry is not None else None
+
+
+def put(slug: str, post_id: int, body: bytes) -> None:
+    """
+    Cache the ``render``-ed body of a published post, evicting the least
+    recently used entries beyond ``POST_CACHE_SIZE``.
+    """
+    if settings.POST_CACHE_SIZE <= 0:
+        return
+    with _lock:
+        _entries[slug] = (time.monotonic() + settings.POST_CACHE_TTL, post_id, body)
+        _entries.move_to_end(slug)
+        _slugs[post_id] = slug
+        while len(_entries) > settings.POST_CACHE_SIZE:
+            _, (_, evicted_id, _) = _entries.popitem(last=False)
+            _slugs.pop(evicted_id, None)
+
+
+def invalidate(post_ids: Iterable[int]) -> None:
+    """
+    Drop the cached responses of the given posts.
+    """
+    with _lock:
+        for post_id in post_ids:
+            slug = _slugs.pop(post_id, None)
+            if slug is not None:
+                _entries.pop(slug, None)
+
+
+def clear() -> None:
+    """
+    Drop every cached response.
+    """
+    with _lock:
+        _entries.clear()
+        _slugs.clear()
+
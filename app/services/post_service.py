@@ -0,0 +1,161 @@
+from typing import Optional, List, Any, Iterable, Dict
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session, selectinload
+from app.core.settings import settings
+from app.models.blog import Comment, Like, Post, PostStatus
+from app.services import storage, view_counter
+
+# Columns needed to render a post card; excludes content and relationships.
+SUMMARY_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.slug,
+    Post.excerpt,
+    Post.image,
+    Post.image_variants,
+    Post.status,
+    Post.author_id,
+    Post.category_id,
+    Post.created_at,
+)
+
+# Statements of the hottest read paths, built once with bound parameters so
+# every call reuses the same object and SQLAlchemy's compiled-SQL cache entry.
+# Startup warmup executes them once, so the first request skips compilation.
+POST_BY_SLUG = select(Post).where(Post.slug == bindparam("slug"))
+LIKES_COUNT = select(func.count(Like.id)).where(Like.post_id == bindparam("post_id"))
+HOT_POSTS = (
+    select(Post)
+    .where(Post.status == PostStatus.PUBLISHED)
+    .order_by(Post.created_at.desc())
+    .limit(bindparam("limit"))
+    .options(
+        selectinload(Post.author),
+        selectinload(Post.category),
+        selectinload(Post.comments).selectinload(Comment.author),
+    )
+)
+
+
+def get_post_by_slug(db: Session, slug: str) -> Optional[Post]:
+    """
+    Get a post by its slug, or None if there is no such post.
+    """
+    return db.execute(POST_BY_SLUG, {"slug": slug}).scalars().first()
+
+
+def count_likes(db: Session, post_id: int) -> int:
+    """
+    Count the likes of a post.
+    """
+    return db.execute(LIKES_COUNT, {"post_id": post_id}).scalar_one()
+
+
+def get_hot_posts(db: Session, limit: int) -> List[Post]:
+    """
+    Get the newest published posts, the head of the public feed, with the
+    relationships needed to render them loaded in bulk.
+
+    Args:
+        db: Database session
+        limit: Maximum number of posts to return
+
+    Returns:
+        Posts, newest first, with ``likes_count`` and ``views`` set
+    """
+    posts = db.execute(HOT_POSTS, {"limit": limit}).scalars().all()
+    views = view_counter.get_counts(db, [post.id for post in posts])
+    for post in posts:
+        post.likes_count = count_likes(db, post.id)
+        post.views = views[post.id]
+    return posts
+
+
+def get_posts_page_by_status(
+    db: Session,
+    status: PostStatus,
+    limit: int = 50,
+    after_id: Optional[int] = None,
+) -> List[Any]:
+    """
+    Get one keyset-paginated page of post summaries with the given status.
+
+    Args:
+        db: Database session
+        status: Post status to list
+        limit: Maximum number of rows to return
+        after_id: Only return posts with an ID greater than this cursor
+
+    Returns:
+        Summary rows in ascending ID order (oldest first)
+    """
+    query = db.query(*SUMMARY_COLUMNS).filter(Post.status == status)
+    if after_id is not None:
+        query = query.filter(Post.id > after_id)
+    return query.order_by(Post.id).limit(limit).all()
+
+
+def bulk_update_status(db: Session, post_ids: Iterable[int], status: PostStatus) -> int:
+    """
+    Set the status of many posts with a single UPDATE statement.
+
+    The legacy ``published`` flag is kept in sync with the new status.
+
+    Args:
+        db: Database session
+        post_ids: IDs of the posts to update
+        status: New post status
+
+    Returns:
+        Number of rows updated
+    """
+    ids = sorted(set(post_ids))
+    if not ids:
+        return 0
+    updated = (
+        db.query(Post)
+        .filter(Post.id.in_(ids))
+        .update(
+            {Post.status: status, Post.published: status == PostStatus.PUBLISHED},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return updated
+
+
+def build_image_variants(image: Optional[str]) -> Optional[Dict[str, str]]:
+    """
+    Build the responsive width variants for a post image.
+
+    Args:
+        image: Image URL
+
+    Returns:
+        Mapping of width to URL, or None if the storage backend cannot
+        resize this image
+    """
+    if not image:
+        return None
+    variants = storage.get_storage().get_variants(image, settings.IMAGE_VARIANT_WIDTHS)
+    if variants is None:
+        return None
+    # JSON object keys are strings; the response schema turns them back into ints
+    return {str(width): url for width, url in variants.items()}
+
+
+def set_post_image(post: Post, image: Optional[str]) -> None:
+    """
+    Set a post's image and store its precomputed variants alongside it.
+
+    Variants are built here, once per image change, so listings can serve
+    them without calling the URL builder on every render.
+
+    Args:
+        post: Post to update (not committed)
+        image: New image URL
+    """
+    if image == post.image and post.image_variants is not None:
+        return
+    post.image = image
+    post.image_variants = build_image_variants(image)
@@ -0,0 +1,428 @@
+"""
+Related posts.
+
+Every published post keeps its ``RELATED_POSTS`` best neighbors in
+``post_related``, so serving them is one indexed lookup. A neighbor's score
+adds up, with the ``RELATED_*_WEIGHT`` weights:
+
+- co-likes: users who liked both posts, as a cosine over each post's likes,
+- terms: Jaccard overlap of the title and excerpt words,
+- category: 1 if both posts share a category.
+
+Candidates are the posts sharing a liker (from one grouped self-join of
+``likes`` per batch) or a distinctive term; posts short of neighbors are
+topped up with the newest posts of their category.
+
+Lists are rebuilt in the background, in batches of ``RELATED_BATCH_SIZE``
+posts per transaction: posts published on this worker first, then any
+published post whose list is missing or older than ``RELATED_MAX_AGE_HOURS``,
+which picks up new likes and posts published elsewhere. A rebuilt post is
+also offered to each of its neighbors' lists. Every worker sweeps for
+stale posts; each one is claimed by a single worker before it is rebuilt.
+
+Each worker keeps the term index of published posts in memory and only
+re-tokenizes posts that are new or updated, and like counts are looked up
+for the posts being rebuilt and their co-liked candidates only, so a
+cycle's cost follows the work it does rather than the size of the tables.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import and_, func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from starlette.concurrency import run_in_threadpool
+from app.core.database import SessionLocal
+from app.core.settings import settings
+from app.models.blog import Like, Post, PostStatus
+from app.models.ranking import PostRelated, PostRelatedBuild
+from app.services.post_service import SUMMARY_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]{3,}")
+STOPWORDS = frozenset(
+    "the and for with that this from your you are was were have has had how what why when "
+    "who which will would can could should into about over under after before than then "
+    "them they their there these those its our out not but all any more most some such "
+    "just also very only own same too new one two get got use using via".split()
+)
+
+# Posts published by this process, waiting for their first list
+_pending: Set[int] = set()
+_pending_lock = threading.Lock()
+_task: Optional[asyncio.Task] = None
+
+# How long a worker's claim on a stale post holds before others may retry it
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+class _Corpus:
+    """
+    Published posts' categories and terms, with an inverted term index.
+
+    Kept between cycles and synced incrementally: each sync scans the IDs
+    and categories of published posts, but only loads and tokenizes the
+    text of posts that are new or were updated since the last sync.
+    """
+
+    # Updates committed this long after their updated_at are still picked up
+    SYNC_MARGIN = timedelta(minutes=5)
+
+    def __init__(self):
+        self.categories: Dict[int, Optional[int]] = {}
+        self.terms: Dict[int, Set[str]] = {}
+        self.newest: Dict[Optional[int], List[int]] = {}
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._synced_at: Optional[datetime] = None
+
+    def sync(self, db: Session) -> None:
+        started = datetime.now(timezone.utc)
+        categories = dict(
+            db.query(Post.id, Post.category_id).filter(Post.status == PostStatus.PUBLISHED)
+        )
+        for post_id in set(self.terms) - set(categories):
+            self._set_terms(post_id, set())
+            del self.terms[post_id]
+
+        changed = [post_id for post_id in categories if post_id not in self.terms]
+        if self._synced_at is not None:
+            changed.extend(
+                post_id for post_id, in db.query(Post.id).filter(
+                    Post.status == PostStatus.PUBLISHED,
+                    Post.updated_at >= self._synced_at - self.SYNC_MARGIN,
+                )
+            )
+        for start in range(0, len(changed), settings.RELATED_BATCH_SIZE):
+            rows = db.query(Post.id, Post.title, Post.excerpt).filter(
+                Post.id.in_(changed[start:start + settings.RELATED_BATCH_SIZE])
+            )
+            for post_id, title, excerpt in rows:
+                self._set_terms(post_id, extract_terms(f"{title or ''} {excerpt or ''}"))
+
+        newest: Dict[Optional[int], List[int]] = defaultdict(list)
+        for post_id in sorted(categories, reverse=True):
+            newest[categories[post_id]].append(post_id)
+        self.categories = categories
+        self.newest = newest
+        self._synced_at = started
+
+    def postings(self, term: str) -> Iterable[int]:
+        """
+        Posts using ``term``; empty for terms in more than
+        ``RELATED_MAX_TERM_POSTS`` posts, which say little about relatedness.
+        """
+        ids = self._postings.get(term, ())
+        return ids if len(ids) <= settings.RELATED_MAX_TERM_POSTS else ()
+
+    def _set_terms(self, post_id: int, terms: Set[str]) -> None:
+        old = self.terms.get(post_id, set())
+        for term in old - terms:
+            self._postings[term].discard(post_id)
+            if not self._postings[term]:
+                del self._postings[term]
+        for term in terms - old:
+            self._postings[term].add(post_id)
+        self.terms[post_id] = terms
+
+
+# Kept between rebuilds and synced incrementally
+_corpus = _Corpus()
+_corpus_lock = threading.Lock()
+
+
+def extract_terms(text: str) -> Set[str]:
+    """
+    Lowercased words of at least three characters, minus stopwords.
+    """
+    return {word for word in _WORD.findall(text.lower()) if word not in STOPWORDS}
+
+
+def get_related(db: Session, slug: str, limit: int = 5) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get the precomputed related posts of a published post.
+
+    Args:
+        db: Database session
+        slug: Slug of the post
+        limit: Maximum number of posts to return
+
+    Returns:
+        Post summary dicts with a ``score``, best first; None if there is
+        no published post with this slug
+    """
+    source = aliased(Post)
+    rows = (
+        db.query(*SUMMARY_COLUMNS, PostRelated.score)
+        .join(PostRelated, PostRelated.related_id == Post.id)
+        .join(source, source.id == PostRelated.post_id)
+        .filter(source.slug == slug, source.status == PostStatus.PUBLISHED)
+        .filter(Post.status == PostStatus.PUBLISHED)
+        .order_by(PostRelated.score.desc())
+        .limit(limit)
+        .all()
+    )
+    if rows:
+        return [dict(row._mapping) for row in rows]
+    exists = db.query(Post.id).filter(Post.slug == slug, Post.status == PostStatus.PUBLISHED).first()
+    return [] if exists else None
+
+
+def enqueue(post_ids: Iterable[int]) -> None:
+    """
+    Schedule newly published posts for a rebuild on the next cycle.
+    """
+    with _pending_lock:
+        _pending.update(post_ids)
+
+
+def rebuild(db: Session, post_ids: Iterable[int]) -> int:
+    """
+    Recompute the related lists of the given posts and offer each of them
+    to its neighbors' lists.
+
+    Args:
+        db: Database session
+        post_ids: Posts to rebuild; unpublished ones are skipped
+
+    Returns:
+        Number of posts rebuilt
+    """
+    ids = list(dict.fromkeys(post_ids))
+    if not ids:
+        return 0
+    with _corpus_lock:
+        _corpus.sync(db)
+        ids = [post_id for post_id in ids if post_id in _corpus.categories]
+        rebuilt = 0
+        for start in range(0, len(ids), settings.RELATED_BATCH_SIZE):
+            batch = ids[start:start + settings.RELATED_BATCH_SIZE]
+            try:
+                _rebuild_batch(db, _corpus, batch)
+            except IntegrityError:
+                # Another worker rebuilt an overlapping set at the same time
+                db.rollback()
+                logger.info("Skipped %d related-post lists rebuilt concurrently", len(batch))
+            else:
+                rebuilt += len(batch)
+    return rebuilt
+
+
+def start() -> None:
+    """
+    Start rebuilding lists every ``RELATED_REFRESH_INTERVAL`` seconds.
+    """
+    global _task
+    if _task is None and settings.RELATED_REFRESH_INTERVAL > 0:
+        _task = asyncio.create_task(_refresh_loop())
+
+
+async def shutdown() -> None:
+    """
+    Stop the rebuild task.
+    """
+    global _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+
+
+def _colikes(db: Session, batch: List[int]) -> Dict[int, Dict[int, int]]:
+    liked = aliased(Like)
+    also_liked = aliased(Like)
+    rows = (
+        db.query(liked.post_id, also_liked.post_id, func.count())
+        .join(also_liked, and_(
+            also_liked.user_id == liked.user_id,
+            also_liked.post_id != liked.post_id,
+        ))
+        .filter(liked.post_id.in_(batch))
+        .group_by(liked.post_id, also_liked.post_id)
+    )
+    shared: Dict[int, Dict[int, int]] = defaultdict(dict)
+    for post_id, other_id, count in rows:
+        shared[post_id][other_id] = count
+    return shared
+
+
+def _neighbors(
+    corpus: _Corpus,
+    like_counts: Dict[int, int],
+    colikes: Dict[int, int],
+    post_id: int,
+) -> List[Tuple[float, int]]:
+    category = corpus.categories[post_id]
+    terms = corpus.terms[post_id]
+    candidates = set(colikes)
+    for term in terms:
+        candidates.update(corpus.postings(term))
+    candidates.discard(post_id)
+
+    scored = []
+    for other in candidates:
+        if other not in corpus.categories:
+            continue  # not published
+        score = 0.0
+        shared = colikes.get(other)
+        if shared:
+            score += settings.RELATED_COLIKE_WEIGHT * shared / math.sqrt(
+                like_counts.get(post_id, shared) * like_counts.get(other, shared)
+            )
+        other_terms = corpus.terms[other]
+        if terms and other_terms:
+            overlap = len(terms & other_terms)
+            if overlap:
+                score += settings.RELATED_TERM_WEIGHT * overlap / len(terms | other_terms)
+        if category is not None and corpus.categories[other] == category:
+            score += settings.RELATED_CATEGORY_WEIGHT
+        if score > 0:
+            scored.append((score, other))
+    top = heapq.nlargest(settings.RELATED_POSTS, scored)
+
+    if len(top) < settings.RELATED_POSTS and category is not None and settings.RELATED_CATEGORY_WEIGHT > 0:
+        chosen = {other for _, other in top} | {post_id}
+        for other in corpus.newest[category]:
+            if len(top) >= settings.RELATED_POSTS:
+                break
+            if other not in chosen:
+                top.append((settings.RELATED_CATEGORY_WEIGHT, other))
+    return top
+
+
+def _like_counts(db: Session, post_ids: Iterable[int]) -> Dict[int, int]:
+    ids = list(post_ids)
+    counts: Dict[int, int] = {}
+    for start in range(0, len(ids), settings.RELATED_BATCH_SIZE):
+        counts.update(
+            db.query(Like.post_id, func.count(Like.id))
+            .filter(Like.post_id.in_(ids[start:start + settings.RELATED_BATCH_SIZE]))
+            .group_by(Like.post_id)
+        )
+    return counts
+
+
+def _rebuild_batch(db: Session, corpus: _Corpus, batch: List[int]) -> None:
+    colikes = _colikes(db, batch)
+    # Only the batch and the posts sharing a liker with it need like counts
+    like_counts = _like_counts(db, set(batch).union(*colikes.values()))
+    lists = {post_id: _neighbors(corpus, like_counts, colikes[post_id], post_id) for post_id in batch}
+
+    db.query(PostRelated).filter(PostRelated.post_id.in_(batch)).delete(synchronize_session=False)
+    rows = [
+        {"post_id": post_id, "related_id": other, "score": score}
+        for post_id, neighbors in lists.items()
+        for score, other in neighbors
+    ]
+
+    # Scores are symmetric, so each neighbor may want this post back
+    offers: Dict[int, Dict[int, float]] = defaultdict(dict)
+    for post_id, neighbors in lists.items():
+        for score, other in neighbors:
+            if other not in lists:
+                offers[other][post_id] = score
+    if offers:
+        current: Dict[int, Dict[int, float]] = defaultdict(dict)
+        existing = db.query(PostRelated.post_id, PostRelated.related_id, PostRelated.score).filter(
+            PostRelated.post_id.in_(list(offers))
+        )
+        for post_id, related_id, score in existing:
+            current[post_id][related_id] = score
+        changed = []
+        for other, offered in offers.items():
+            merged = {**current[other], **offered}
+            top = dict(heapq.nlargest(settings.RELATED_POSTS, merged.items(), key=lambda item: item[1]))
+            if top != current[other]:
+                changed.append(other)
+                rows.extend(
+                    {"post_id": other, "related_id": related_id, "score": score}
+                    for related_id, score in top.items()
+                )
+        if changed:
+            db.query(PostRelated).filter(PostRelated.post_id.in_(changed)).delete(synchronize_session=False)
+
+    if rows:
+        db.execute(insert(PostRelated), rows)
+    now = datetime.now(timezone.utc)
+    db.query(PostRelatedBuild).filter(PostRelatedBuild.post_id.in_(batch)).delete(synchronize_session=False)
+    db.execute(insert(PostRelatedBuild), [{"post_id": post_id, "built_at": now} for post_id in batch])
+    db.commit()
+
+
+def _claim_stale_posts(db: Session, limit: int) -> List[int]:
+    # Every worker sweeps, so each stale post is claimed before it is
+    # rebuilt: its build time is moved forward with a compare-and-set, and
+    # only the worker whose write lands rebuilds it. A claim lapses after
+    # CLAIM_TIMEOUT, so a post whose rebuild failed is picked up again.
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(hours=settings.RELATED_MAX_AGE_HOURS)
+    rows = (
+        db.query(Post.id, PostRelatedBuild.built_at)
+        .outerjoin(PostRelatedBuild, PostRelatedBuild.post_id == Post.id)
+        .filter(Post.status == PostStatus.PUBLISHED)
+        .filter((PostRelatedBuild.built_at.is_(None)) | (PostRelatedBuild.built_at < cutoff))
+        # Never-built posts first, then the oldest lists
+        .order_by(PostRelatedBuild.built_at.isnot(None), PostRelatedBuild.built_at)
+        .limit(limit)
+        .all()
+    )
+    claimed_at = min(cutoff + CLAIM_TIMEOUT, now)
+    claimed = []
+    # In ID order, so workers claiming overlapping sets lock rows in the same order
+    for post_id, built_at in sorted(row for row in rows if row.built_at is not None):
+        if (
+            db.query(PostRelatedBuild)
+            .filter(PostRelatedBuild.post_id == post_id, PostRelatedBuild.built_at == built_at)
+            .update({PostRelatedBuild.built_at: claimed_at}, synchronize_session=False)
+        ):
+            claimed.append(post_id)
+    db.commit()
+
+    unbuilt = [post_id for post_id, built_at in rows if built_at is None]
+    if unbuilt:
+        try:
+            db.execute(insert(PostRelatedBuild), [
+                {"post_id": post_id, "built_at": claimed_at} for post_id in unbuilt
+            ])
+            db.commit()
+            claimed.extend(unbuilt)
+        except IntegrityError:
+            # Another worker claimed some of them; claim the rest one by one
+            db.rollback()
+            for post_id in unbuilt:
+                try:
+                    db.add(PostRelatedBuild(post_id=post_id, built_at=claimed_at))
+                    db.commit()
+                except IntegrityError:
+                    db.rollback()
+                else:
+                    claimed.append(post_id)
+    return claimed
+
+
+def _refresh_once() -> int:
+    with _pending_lock:
+        pending = list(_pending)
+        _pending.clear()
+    db = SessionLocal()
+    try:
+        return rebuild(db, pending + _claim_stale_posts(db, settings.RELATED_SWEEP_BATCH))
+    finally:
+        db.close()
+
+
+async def _refresh_loop() -> None:
+    while True:
+        try:
+            rebuilt = await run_in_threadpool(_refresh_once)
+            if rebuilt:
+                logger.info("Rebuilt %d related-post lists", rebuilt)
+        except Exception:
+            logger.exception("Related-post rebuild failed")
+        await asyncio.sleep(settings.RELATED_REFRESH_INTERVAL)
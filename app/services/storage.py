@@ -0,0 +1,283 @@
+import abc
+import hashlib
+import io
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, BinaryIO
+from starlette.concurrency import run_in_threadpool
+from app.core.settings import settings
+
+
+class FileTooLargeError(Exception):
+    """Raised when an upload stream exceeds its size limit."""
+
+
+class LimitedReader:
+    """
+    Read-only wrapper that streams a file in fixed-size chunks and
+    raises FileTooLargeError once more than ``max_size`` bytes are read.
+
+    With ``sha256`` set, it also hashes the bytes as they pass through, so
+    the digest of an upload is known once it has been streamed, without a
+    separate pass over the file. Rewinding to the start resets the digest.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        max_size: Optional[int] = None,
+        chunk_size: int = None,
+        sha256: bool = False
+    ):
+        self.fileobj = fileobj
+        self.max_size = max_size
+        self.chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+        self.bytes_read = 0
+        self.digest = hashlib.sha256() if sha256 else None
+
+    def read(self, size: int = -1) -> bytes:
+        # Never more than one chunk, and never more than the caller asked for
+        chunk = self.fileobj.read(min(size, self.chunk_size) if size >= 0 else self.chunk_size)
+        self.bytes_read += len(chunk)
+        if self.max_size is not None and self.bytes_read > self.max_size:
+            raise FileTooLargeError(f"File exceeds the {self.max_size} byte limit")
+        if self.digest is not None:
+            self.digest.update(chunk)
+        return chunk
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        position = self.fileobj.seek(offset, whence)
+        if whence == 0:
+            self.bytes_read = position
+        if position == 0 and self.digest is not None:
+            self.digest = hashlib.sha256()
+        return position
+
+    def tell(self) -> int:
+        return self.fileobj.tell()
+
+    def hexdigest(self) -> str:
+        """
+        Hex SHA-256 of the bytes read since the last rewind.
+        """
+        return self.digest.hexdigest()
+
+
+class StorageBackend(abc.ABC):
+    """
+    Interface for media storage.
+
+    Upload results use the keys of ``FileUploadResponse`` (file_id, name,
+    url, thumbnail_url, file_type, size, width, height).
+    """
+
+    @abc.abstractmethod
+    async def upload_file(
+        self,
+        file: Any,
+        file_name: str,
+        folder: str = "general",
+        tags: List[str] = None,
+        is_private_file: bool = False,
+        max_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Store a file, streaming it in chunks.
+
+        Raises:
+            FileTooLargeError: If the stream exceeds ``max_size``
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete_file(self, file_id: str) -> bool:
+        """
+        Delete a stored file.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_file_details(self, file_id: str) -> Dict[str, Any]:
+        """
+        Get metadata for a stored file.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_url(self, path: str, transformations: List[Dict[str, Any]] = None) -> str:
+        """
+        Build the public URL for a stored path, optionally transformed.
+        """
+        raise NotImplementedError
+
+    def get_variants(self, url: str, widths: List[int]) -> Optional[Dict[int, str]]:
+        """
+        Build resized variants of an image URL, keyed by width.
+
+        Returns None when the backend cannot resize the image, e.g. because
+        it is hosted elsewhere.
+        """
+        return None
+
+    async def ping(self) -> None:
+        """
+        Check that the backend is reachable.
+
+        Raises:
+            Exception: If it is not
+        """
+
+    async def close(self) -> None:
+        """
+        Release any connections held by the backend.
+        """
+
+
+class LocalStorage(StorageBackend):
+    """
+    Stores files on the local filesystem.
+
+    Each file lives at ``<root>/<file_id>/<name>`` and is served by the
+    media route at ``<base_url>/<file_id>/<name>``. Image transformations
+    are not supported; URLs always point at the original file.
+    """
+
+    FILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def resolve(self, file_id: str) -> Optional[str]:
+        """
+        Get the on-disk path of a stored file, or None if it does not exist.
+        """
+        if not self.FILE_ID_PATTERN.match(file_id):
+            return None
+        directory = os.path.join(self.root, file_id)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return None
+        # Skip uploads still being written
+        names = [name for name in names if not name.startswith(".partial-")]
+        return os.path.join(directory, names[0]) if names else None
+
+    async def upload_file(
+        self,
+        file: Any,
+        file_name: str,
+        folder: str = "general",
+        tags: List[str] = None,
+        is_private_file: bool = False,
+        max_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        if isinstance(file, (bytes, bytearray)):
+            file = io.BytesIO(file)
+        file_id = uuid.uuid4().hex
+        name = _safe_name(file_name)
+        size = await run_in_threadpool(self._write, file, file_id, name, max_size)
+        return {
+            "file_id": file_id,
+            "name": name,
+            "url": f"{self.base_url}/{file_id}/{name}",
+            "thumbnail_url": None,
+            "file_type": _file_type(name),
+            "size": size,
+            "width": None,
+            "height": None,
+        }
+
+    def _write(self, file: BinaryIO, file_id: str, name: str, max_size: Optional[int]) -> int:
+        directory = os.path.join(self.root, file_id)
+        os.makedirs(directory)
+        reader = LimitedReader(file, max_size=max_size)
+        reader.seek(0)
+        # Write to a temp file and rename so readers never see partial files
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".partial-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(reader, out)
+            os.replace(tmp_path, os.path.join(directory, name))
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        return reader.bytes_read
+
+    async def delete_file(self, file_id: str) -> bool:
+        path = self.resolve(file_id)
+        if path is None:
+            raise Exception("Local storage delete error: file not found")
+        await run_in_threadpool(shutil.rmtree, os.path.dirname(path))
+        return True
+
+    async def get_file_details(self, file_id: str) -> Dict[str, Any]:
+        path = self.resolve(file_id)
+        if path is None:
+            raise Exception("Local storage details error: file not found")
+        stat = os.stat(path)
+        name = os.path.basename(path)
+        return {
+            "file_id": file_id,
+            "name": name,
+            "file_path": f"/{file_id}/{name}",
+            "url": f"{self.base_url}/{file_id}/{name}",
+            "file_type": _file_type(name),
+            "mime": mimetypes.guess_type(name)[0] or "application/octet-stream",
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+        }
+
+    def get_url(self, path: str, transformations: List[Dict[str, Any]] = None) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def ping(self) -> None:
+        if not os.path.isdir(self.root):
+            os.makedirs(self.root, exist_ok=True)
+        if not os.access(self.root, os.W_OK):
+            raise Exception(f"Local storage directory {self.root} is not writable")
+
+
+def _safe_name(file_name: str) -> str:
+    name = os.path.basename(file_name or "").strip()
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", name).lstrip(".")
+    return name or "file"
+
+
+def _file_type(name: str) -> str:
+    mime = mimetypes.guess_type(name)[0] or ""
+    return "image" if mime.startswith("image/") else "non-image"
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """
+    Get the storage backend selected by ``STORAGE_BACKEND``, creating it on first use.
+    """
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "local":
+            _storage = LocalStorage(settings.LOCAL_STORAGE_DIR, settings.LOCAL_STORAGE_BASE_URL)
+        else:
+            if not settings.IMAGEKIT_URL_ENDPOINT:
+                raise RuntimeError("IMAGEKIT_URL_ENDPOINT must be set to use the imagekit storage backend")
+            from app.services.imagekit_service import ImageKitStorage
+            _storage = ImageKitStorage()
+    return _storage
+
+
+async def close() -> None:
+    """
+    Close the active storage backend.
+    """
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+        _storage = None
@@ -0,0 +1,231 @@
+"""
+Trending posts.
+
+A post's score is the sum of its likes and comments, each weighted by
+``TRENDING_LIKE_WEIGHT`` / ``TRENDING_COMMENT_WEIGHT`` and halved every
+``TRENDING_HALF_LIFE_HOURS`` since it was made. Scores are kept in
+``post_trending_scores`` as ``rank = log2(score at EPOCH)``: every score
+decays at the same rate, so this order never changes with time and a row
+only needs updating when its post gets new interactions.
+
+A background job folds in likes and comments with IDs above the last
+watermark every ``TRENDING_REFRESH_INTERVAL`` seconds. Every worker runs
+it; advancing the watermark is a compare-and-set, so a batch is applied by
+only one process.
+
+IDs are allocated when a row is inserted but become visible when its
+transaction commits, so a lower ID can appear after a higher one. The job
+therefore stops at the first row created less than
+``TRENDING_GRACE_SECONDS`` ago: a row is counted exactly once as long as its
+transaction commits within that grace period of its ``created_at``.
+
+Removed likes and comments are not subtracted; they decay away like
+everything else. Changing a weight or the half-life only affects new
+interactions until both tables are emptied, which makes the next run
+recompute everything.
+"""
+import asyncio
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.database import SessionLocal
+from app.core.settings import settings
+from app.models.blog import Comment, Like, Post, PostStatus
+from app.models.ranking import PostTrendingScore, RankingWatermark
+from app.services.post_service import SUMMARY_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_task: Optional[asyncio.Task] = None
+
+
+def _sources() -> Dict[str, Tuple[Any, float]]:
+    return {
+        "trending_likes": (Like, settings.TRENDING_LIKE_WEIGHT),
+        "trending_comments": (Comment, settings.TRENDING_COMMENT_WEIGHT),
+    }
+
+
+def decay_offset(moment: datetime) -> float:
+    """
+    Number of half-lives between ``EPOCH`` and ``moment``.
+    """
+    return (_aware(moment) - EPOCH).total_seconds() / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+def score(rank: float, now: Optional[datetime] = None) -> float:
+    """
+    Convert a stored rank to the post's score at ``now``.
+    """
+    return 2.0 ** (rank - decay_offset(now or datetime.now(timezone.utc)))
+
+
+def get_trending(db: Session, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Get the highest-scoring published posts.
+
+    Args:
+        db: Database session
+        limit: Maximum number of posts to return
+
+    Returns:
+        Post summary dicts with a ``score``, highest first
+    """
+    rows = (
+        db.query(*SUMMARY_COLUMNS, PostTrendingScore.rank)
+        .join(Post, Post.id == PostTrendingScore.post_id)
+        .filter(Post.status == PostStatus.PUBLISHED)
+        .order_by(PostTrendingScore.rank.desc())
+        .limit(limit)
+        .all()
+    )
+    now = datetime.now(timezone.utc)
+    return [{**row._mapping, "score": score(row.rank, now)} for row in rows]
+
+
+def refresh(db: Session) -> int:
+    """
+    Fold all interactions newer than the watermarks into the scores, in
+    batches of ``TRENDING_BATCH_SIZE`` rows per source, then drop scores
+    that have decayed below ``TRENDING_MIN_SCORE``.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of likes and comments applied by this call
+    """
+    applied = 0
+    while True:
+        fetched, batch_applied = _refresh_batch(db)
+        applied += batch_applied
+        if fetched < settings.TRENDING_BATCH_SIZE:
+            break
+    floor = decay_offset(datetime.now(timezone.utc)) + math.log2(settings.TRENDING_MIN_SCORE)
+    db.query(PostTrendingScore).filter(PostTrendingScore.rank < floor).delete(synchronize_session=False)
+    db.commit()
+    return applied
+
+
+def start() -> None:
+    """
+    Start refreshing scores every ``TRENDING_REFRESH_INTERVAL`` seconds.
+    """
+    global _task
+    if _task is None and settings.TRENDING_REFRESH_INTERVAL > 0:
+        _task = asyncio.create_task(_refresh_loop())
+
+
+async def shutdown() -> None:
+    """
+    Stop the refresh task.
+    """
+    global _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+
+
+def _refresh_batch(db: Session) -> Tuple[int, int]:
+    watermarks = {row.source: row.last_id for row in db.query(RankingWatermark)}
+    horizon = datetime.now(timezone.utc) - timedelta(seconds=settings.TRENDING_GRACE_SECONDS)
+    terms: Dict[int, List[float]] = defaultdict(list)
+    claims = {}
+    fetched = 0
+    for source, (model, weight) in _sources().items():
+        old = watermarks.get(source)
+        rows = (
+            db.query(model.id, model.post_id, model.created_at)
+            .filter(model.id > (old or 0))
+            .order_by(model.id)
+            .limit(settings.TRENDING_BATCH_SIZE)
+            .all()
+        )
+        # Rows past the horizon may still have lower-ID neighbors in flight
+        settled = 0
+        for row in rows:
+            if row.created_at is not None and _aware(row.created_at) >= horizon:
+                break
+            settled += 1
+        rows = rows[:settled]
+        if not rows:
+            continue
+        fetched = max(fetched, len(rows))
+        claims[source] = (old, rows[-1].id)
+        if weight <= 0:
+            continue
+        for row in rows:
+            if row.post_id is not None and row.created_at is not None:
+                terms[row.post_id].append(math.log2(weight) + decay_offset(row.created_at))
+    if not claims:
+        return 0, 0
+
+    # Advance the watermarks first; if another process already moved one,
+    # it is applying this batch and we back off.
+    for source, (old, new) in claims.items():
+        if old is None:
+            db.add(RankingWatermark(source=source, last_id=new))
+            try:
+                db.flush()
+            except IntegrityError:
+                db.rollback()
+                return fetched, 0
+        elif not (
+            db.query(RankingWatermark)
+            .filter(RankingWatermark.source == source, RankingWatermark.last_id == old)
+            .update({RankingWatermark.last_id: new}, synchronize_session=False)
+        ):
+            db.rollback()
+            return fetched, 0
+
+    scores = {
+        row.post_id: row
+        for row in db.query(PostTrendingScore).filter(PostTrendingScore.post_id.in_(list(terms)))
+    }
+    for post_id, post_terms in terms.items():
+        existing = scores.get(post_id)
+        if existing is not None:
+            existing.rank = _log2_sum(post_terms + [existing.rank])
+        else:
+            db.add(PostTrendingScore(post_id=post_id, rank=_log2_sum(post_terms)))
+    db.commit()
+    return fetched, sum(len(post_terms) for post_terms in terms.values())
+
+
+def _aware(moment: datetime) -> datetime:
+    # SQLite drops the zone
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+
+def _log2_sum(exponents: List[float]) -> float:
+    # log2(sum(2 ** e)) without overflowing: 2 ** e is far beyond float
+    # range for interactions years after EPOCH
+    top = max(exponents)
+    return top + math.log2(sum(2.0 ** (e - top) for e in exponents))
+
+
+def _refresh_once() -> int:
+    db = SessionLocal()
+    try:
+        return refresh(db)
+    finally:
+        db.close()
+
+
+async def _refresh_loop() -> None:
+    while True:
+        try:
+            applied = await run_in_threadpool(_refresh_once)
+            if applied:
+                logger.info("Applied %d interactions to trending scores", applied)
+        except Exception:
+            logger.exception("Trending refresh failed")
+        await asyncio.sleep(settings.TRENDING_REFRESH_INTERVAL)
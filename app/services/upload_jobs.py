@@ -0,0 +1,329 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, BinaryIO, Tuple
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.database import SessionLocal
+from app.core.settings import settings
+from app.models.upload import UploadJob, UploadJobStatus
+from app.services import storage, upload_service
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the upload job queue is at capacity."""
+
+
+@dataclass
+class _Task:
+    job_id: str
+    owner_id: int
+    sha256: str
+    spool_path: str
+    file_name: str
+    folder: str
+    tags: List[str]
+    max_size: Optional[int]
+
+
+# Per-process queue and worker pool. Job state lives in the database so any
+# worker process can answer status polls, but a job is executed by the
+# process that accepted it, since the spooled file is on its local disk.
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+_pending: Dict[str, _Task] = {}
+
+
+def start() -> None:
+    """
+    Start the worker pool if it is not already running.
+    """
+    global _queue
+    if _workers:
+        return
+    _queue = asyncio.Queue(maxsize=settings.UPLOAD_JOB_QUEUE_SIZE)
+    for _ in range(settings.UPLOAD_JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+async def shutdown(timeout: float = 10.0) -> None:
+    """
+    Stop the worker pool, giving queued jobs ``timeout`` seconds to finish.
+
+    Jobs that are still queued or running afterwards are marked failed and
+    their spool files are removed.
+    """
+    global _queue
+    if not _workers:
+        return
+    try:
+        await asyncio.wait_for(_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
+
+    for task in list(_pending.values()):
+        await run_in_threadpool(
+            _update_job,
+            task.job_id,
+            status=UploadJobStatus.FAILED,
+            error="Server shut down before the upload completed",
+        )
+        _discard(task)
+
+
+def spool(fileobj: BinaryIO, max_size: Optional[int] = None) -> Tuple[str, str]:
+    """
+    Copy an upload into the spool directory in chunks, hashing it on the way.
+
+    Args:
+        fileobj: Binary file object positioned anywhere
+        max_size: Maximum allowed size in bytes
+
+    Returns:
+        Path of the spooled copy and the hex SHA-256 of its content
+
+    Raises:
+        FileTooLargeError: If the file exceeds ``max_size``
+    """
+    os.makedirs(settings.UPLOAD_SPOOL_DIR, exist_ok=True)
+    reader = storage.LimitedReader(fileobj, max_size=max_size, sha256=True)
+    reader.seek(0)
+    fd, path = tempfile.mkstemp(dir=settings.UPLOAD_SPOOL_DIR, suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            shutil.copyfileobj(reader, out, settings.UPLOAD_CHUNK_SIZE)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, reader.hexdigest()
+
+
+def remove_spool(path: str) -> None:
+    """
+    Delete a spooled upload, e.g. one that turned out to be a duplicate.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def enqueue(
+    owner_id: int,
+    spool_path: str,
+    file_name: str,
+    folder: str,
+    tags: List[str],
+    sha256: str,
+    max_size: Optional[int] = None,
+) -> UploadJob:
+    """
+    Queue the transfer of a spooled upload to storage.
+
+    The job takes over the spool file; it is removed once the job finishes,
+    or right away if the job cannot be queued.
+
+    Args:
+        owner_id: ID of the uploading user
+        spool_path: Path returned by ``spool``
+        file_name: Original file name
+        folder: Storage folder
+        tags: Storage tags
+        sha256: Hex SHA-256 of the content, recorded once stored
+        max_size: Size limit enforced while streaming to storage
+
+    Returns:
+        The queued job
+
+    Raises:
+        QueueFullError: If the queue is at capacity
+    """
+    start()
+    if _queue.full():
+        await run_in_threadpool(remove_spool, spool_path)
+        raise QueueFullError("Upload queue is full")
+
+    job = await run_in_threadpool(_create_job, owner_id, file_name)
+    task = _Task(job.id, owner_id, sha256, spool_path, file_name, folder, tags, max_size)
+    _pending[job.id] = task
+    try:
+        _queue.put_nowait(task)
+    except asyncio.QueueFull:
+        await run_in_threadpool(
+            _update_job, job.id, status=UploadJobStatus.FAILED, error="Upload queue is full"
+        )
+        _discard(task)
+        raise QueueFullError("Upload queue is full")
+    return job
+
+
+async def complete(owner_id: int, file_name: str, result: Dict[str, Any]) -> UploadJob:
+    """
+    Create a job that has already succeeded, for uploads that needed no transfer.
+
+    Args:
+        owner_id: ID of the uploading user
+        file_name: Original file name
+        result: Upload response payload
+
+    Returns:
+        The finished job
+    """
+    return await run_in_threadpool(
+        _create_job,
+        owner_id,
+        file_name,
+        status=UploadJobStatus.SUCCEEDED,
+        result=json.dumps(result),
+    )
+
+
+def get_job(db: Session, job_id: str) -> Optional[UploadJob]:
+    """
+    Get an upload job by ID.
+    """
+    return db.query(UploadJob).filter(UploadJob.id == job_id).first()
+
+
+def to_response(job: UploadJob) -> Dict[str, Any]:
+    """
+    Build the status payload for a job.
+    """
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "attempts": job.attempts or 0,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+    }
+
+
+def _create_job(
+    owner_id: int,
+    file_name: str,
+    status: UploadJobStatus = UploadJobStatus.QUEUED,
+    result: Optional[str] = None,
+) -> UploadJob:
+    db = SessionLocal()
+    try:
+        job = UploadJob(
+            id=uuid.uuid4().hex,
+            owner_id=owner_id,
+            file_name=file_name,
+            status=status,
+            attempts=0,
+            result=result,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        db.expunge(job)
+        return job
+    finally:
+        db.close()
+
+
+def _update_job(job_id: str, **values: Any) -> None:
+    db = SessionLocal()
+    try:
+        db.query(UploadJob).filter(UploadJob.id == job_id).update(values)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _record_upload(owner_id: int, sha256: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        upload = upload_service.record_or_claim(db, owner_id, sha256, result)
+        return upload_service.to_response(upload)
+    finally:
+        db.close()
+
+
+def _discard(task: _Task) -> None:
+    _pending.pop(task.job_id, None)
+    remove_spool(task.spool_path)
+
+
+async def _worker() -> None:
+    while True:
+        task = await _queue.get()
+        try:
+            await _process(task)
+        except Exception as e:
+            logger.exception("Upload job %s crashed", task.job_id)
+            try:
+                # Give pollers a terminal state instead of a job stuck running
+                await run_in_threadpool(
+                    _update_job,
+                    task.job_id,
+                    status=UploadJobStatus.FAILED,
+                    error=str(e) or type(e).__name__,
+                )
+            except Exception:
+                logger.exception("Could not mark upload job %s failed", task.job_id)
+            _discard(task)
+        finally:
+            _queue.task_done()
+
+
+async def _process(task: _Task) -> None:
+    # On cancellation (shutdown) the task stays in _pending so shutdown()
+    # can mark it failed and clean up its spool file.
+    await run_in_threadpool(_update_job, task.job_id, status=UploadJobStatus.RUNNING)
+    values: Dict[str, Any] = {"status": UploadJobStatus.FAILED}
+    attempt = 0
+    while attempt < settings.UPLOAD_JOB_MAX_ATTEMPTS:
+        attempt += 1
+        try:
+            with open(task.spool_path, "rb") as fileobj:
+                result = await storage.get_storage().upload_file(
+                    file=fileobj,
+                    file_name=task.file_name,
+                    folder=task.folder,
+                    tags=task.tags,
+                    max_size=task.max_size,
+                )
+        except storage.FileTooLargeError as e:
+            values["error"] = str(e)
+            break
+        except Exception as e:
+            values["error"] = str(e)
+            logger.warning("Upload job %s attempt %d failed: %s", task.job_id, attempt, e)
+            if attempt < settings.UPLOAD_JOB_MAX_ATTEMPTS:
+                await asyncio.sleep(settings.STORAGE_RETRY_BACKOFF * (2 ** attempt))
+            continue
+        result = await _finish_upload(task, result)
+        values = {
+            "status": UploadJobStatus.SUCCEEDED,
+            "result": json.dumps(result),
+            "error": None,
+        }
+        break
+    await run_in_threadpool(_update_job, task.job_id, attempts=attempt, **values)
+    _discard(task)
+
+
+async def _finish_upload(task: _Task, result: Dict[str, Any]) -> Dict[str, Any]:
+    # If the same content was recorded (by any owner) while the job ran,
+    # keep that copy and drop the one just stored.
+    recorded = await run_in_threadpool(_record_upload, task.owner_id, task.sha256, result)
+    if recorded["file_id"] != result["file_id"]:
+        try:
+            await storage.get_storage().delete_file(result["file_id"])
+        except Exception:
+            logger.warning("Could not delete duplicate file %s", result["file_id"])
+    return recorded
@@ -0,0 +1,194 @@
+from typing import Optional, List, Dict, Any, BinaryIO
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.upload import Upload
+from app.services.storage import LimitedReader
+
+RESPONSE_FIELDS = (
+    "file_id", "name", "url", "thumbnail_url", "file_type", "size", "width", "height",
+)
+
+
+def hash_file(fileobj: BinaryIO, max_size: Optional[int] = None) -> str:
+    """
+    Compute the SHA-256 of a file in chunks, without loading it into memory.
+
+    Args:
+        fileobj: Binary file object; it is rewound before and after hashing
+        max_size: Maximum allowed size in bytes
+
+    Returns:
+        Hex digest
+
+    Raises:
+        FileTooLargeError: If the file exceeds ``max_size``
+    """
+    reader = LimitedReader(fileobj, max_size=max_size, sha256=True)
+    reader.seek(0)
+    while reader.read():
+        pass
+    fileobj.seek(0)
+    return reader.hexdigest()
+
+
+def get_upload_by_hash(
+    db: Session,
+    sha256: str,
+    owner_id: Optional[int] = None,
+    prefer_owner_id: Optional[int] = None
+) -> Optional[Upload]:
+    """
+    Get the oldest upload with the given content hash.
+
+    Args:
+        db: Database session
+        sha256: Hex SHA-256 of the content
+        owner_id: Restrict the lookup to this owner's uploads
+        prefer_owner_id: Return this owner's upload, if any, ahead of
+            older ones by other owners
+
+    Returns:
+        Upload object if found, None otherwise
+    """
+    query = db.query(Upload).filter(Upload.sha256 == sha256)
+    if owner_id is not None:
+        query = query.filter(Upload.owner_id == owner_id)
+    if prefer_owner_id is not None:
+        query = query.order_by((Upload.owner_id == prefer_owner_id).desc())
+    return query.order_by(Upload.id).first()
+
+
+def get_uploads_by_file_id(db: Session, file_id: str) -> List[Upload]:
+    """
+    Get every reference to a stored file.
+
+    Args:
+        db: Database session
+        file_id: Storage file ID
+
+    Returns:
+        List of uploads sharing the file
+    """
+    return db.query(Upload).filter(Upload.file_id == file_id).all()
+
+
+def claim_upload(db: Session, owner_id: int, source: Upload) -> Upload:
+    """
+    Give an owner a reference to already-stored content.
+
+    Args:
+        db: Database session
+        owner_id: ID of the uploading user
+        source: Existing upload with the same content
+
+    Returns:
+        The owner's upload record (existing or newly created)
+    """
+    if source.owner_id == owner_id:
+        return source
+    values = {field: getattr(source, field) for field in RESPONSE_FIELDS}
+    return _insert_upload(db, owner_id, source.sha256, values)
+
+
+def record_upload(db: Session, owner_id: int, sha256: str, result: Dict[str, Any]) -> Upload:
+    """
+    Record a file that was just stored.
+
+    Args:
+        db: Database session
+        owner_id: ID of the uploading user
+        sha256: Hex SHA-256 of the content
+        result: Upload result returned by the storage client
+
+    Returns:
+        The owner's upload record. If a concurrent request recorded the same
+        content for this owner first, that record is returned instead.
+    """
+    values = {field: result.get(field) for field in RESPONSE_FIELDS}
+    return _insert_upload(db, owner_id, sha256, values)
+
+
+def find_duplicate(db: Session, owner_id: int, sha256: str) -> Optional[Upload]:
+    """
+    Find already-stored content for an owner, claiming another owner's copy if needed.
+
+    Args:
+        db: Database session
+        owner_id: ID of the uploading user
+        sha256: Hex SHA-256 of the content
+
+    Returns:
+        The owner's upload record, or None if the content is not stored yet
+    """
+    existing = get_upload_by_hash(db, sha256, prefer_owner_id=owner_id)
+    if existing is None:
+        return None
+    return claim_upload(db, owner_id, existing)
+
+
+def record_or_claim(db: Session, owner_id: int, sha256: str, result: Dict[str, Any]) -> Upload:
+    """
+    Record a file that was just stored, unless the same content is already stored.
+
+    Used by both the direct and the background upload paths, so a file
+    stored by either one is deduplicated against every owner's uploads.
+
+    Args:
+        db: Database session
+        owner_id: ID of the uploading user
+        sha256: Hex SHA-256 of the content
+        result: Upload result returned by the storage client
+
+    Returns:
+        The owner's upload record. When its ``file_id`` differs from
+        ``result``, the content was already stored and the caller should
+        delete the copy it just made.
+    """
+    existing = find_duplicate(db, owner_id, sha256)
+    if existing is not None:
+        return existing
+    return record_upload(db, owner_id, sha256, result)
+
+
+def remove_uploads(db: Session, uploads: List[Upload]) -> int:
+    """
+    Delete upload references and count what is left of the stored file.
+
+    Args:
+        db: Database session
+        uploads: References to delete; all must share one file_id
+
+    Returns:
+        Number of references to the file that remain
+    """
+    file_id = uploads[0].file_id
+    for upload in uploads:
+        db.delete(upload)
+    db.commit()
+    return db.query(func.count(Upload.id)).filter(Upload.file_id == file_id).scalar()
+
+
+def to_response(upload: Upload) -> Dict[str, Any]:
+    """
+    Build the upload response payload for a record.
+    """
+    return {field: getattr(upload, field) for field in RESPONSE_FIELDS}
+
+
+def _insert_upload(db: Session, owner_id: int, sha256: str, values: Dict[str, Any]) -> Upload:
+    upload = Upload(owner_id=owner_id, sha256=sha256, **values)
+    db.add(upload)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        existing = get_upload_by_hash(db, sha256, owner_id=owner_id)
+        if existing is None:
+            raise
+        return existing
+    # Detach before committing so the commit does not expire the values
+    # just written; building the response then needs no SELECT.
+    db.expunge(upload)
+    db.commit()
+    return upload
@@ -0,0 +1,298 @@
+import asyncio
+import fcntl
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, AsyncIterator, BinaryIO
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from app.core.database import SessionLocal
+from app.core.settings import settings
+from app.models.upload import UploadSession
+
+logger = logging.getLogger(__name__)
+
+
+class OffsetMismatchError(Exception):
+    """Raised when a chunk does not start at the session's current offset."""
+
+    def __init__(self, expected: int):
+        super().__init__(f"Chunk must start at offset {expected}")
+        self.expected = expected
+
+
+class ChunkOverflowError(Exception):
+    """Raised when a chunk would take the upload past its declared size."""
+
+
+_gc_task: Optional[asyncio.Task] = None
+
+
+def spool_path(session_id: str) -> str:
+    """
+    Get the path of a session's spool file.
+    """
+    return os.path.join(_spool_dir(), f"{session_id}.part")
+
+
+def create_session(
+    db: Session,
+    owner_id: int,
+    file_name: str,
+    content_type: str,
+    folder: str,
+    size: int,
+) -> UploadSession:
+    """
+    Start a resumable upload.
+
+    Args:
+        db: Database session
+        owner_id: ID of the uploading user
+        file_name: Original file name
+        content_type: MIME type of the file
+        folder: Storage folder
+        size: Total size of the file in bytes
+
+    Returns:
+        The new upload session
+    """
+    session = UploadSession(
+        id=uuid.uuid4().hex,
+        owner_id=owner_id,
+        file_name=file_name,
+        content_type=content_type,
+        folder=folder,
+        size=size,
+        received=0,
+        expires_at=_expiry(),
+    )
+    os.makedirs(_spool_dir(), exist_ok=True)
+    open(spool_path(session.id), "wb").close()
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return session
+
+
+def get_session(db: Session, session_id: str) -> Optional[UploadSession]:
+    """
+    Get an upload session by ID, ignoring expired ones.
+    """
+    return (
+        db.query(UploadSession)
+        .filter(
+            UploadSession.id == session_id,
+            UploadSession.expires_at > datetime.now(timezone.utc),
+        )
+        .first()
+    )
+
+
+async def append_chunk(
+    db: Session, session: UploadSession, offset: int, stream: AsyncIterator[bytes]
+) -> int:
+    """
+    Append a streamed chunk to a session's spool file.
+
+    The chunk is written as it arrives. If the client disconnects midway,
+    the bytes received so far are kept and the offset advances to match,
+    so the client can resume from there.
+
+    Args:
+        db: Database session
+        session: Session to append to
+        offset: Byte offset the chunk starts at
+        stream: Chunk body
+
+    Returns:
+        The new offset
+
+    Raises:
+        OffsetMismatchError: If ``offset`` is not the current offset, or
+            another chunk for the session is still being written
+        ChunkOverflowError: If the chunk runs past the declared size
+        FileNotFoundError: If the spool file is not on this host
+    """
+    fileobj = await run_in_threadpool(_claim, db, session, offset)
+    try:
+        written = 0
+        buffer = bytearray()
+        try:
+            async for chunk in stream:
+                written += len(chunk)
+                if offset + written > session.size:
+                    raise ChunkOverflowError(
+                        f"Chunk runs past the declared size of {session.size} bytes"
+                    )
+                if not buffer and len(chunk) >= settings.UPLOAD_CHUNK_SIZE:
+                    await run_in_threadpool(fileobj.write, chunk)
+                    continue
+                # Coalesce small ASGI messages into chunk-sized writes
+                buffer += chunk
+                if len(buffer) >= settings.UPLOAD_CHUNK_SIZE:
+                    await run_in_threadpool(fileobj.write, buffer)
+                    buffer.clear()
+        except ClientDisconnect:
+            # Keep what arrived; the client resumes from the new offset
+            pass
+        if buffer:
+            await run_in_threadpool(fileobj.write, buffer)
+        await run_in_threadpool(fileobj.flush)
+        new_offset = offset + written
+        # Record the offset before the lock is released, so the next
+        # claimant never truncates bytes that were just written
+        await run_in_threadpool(_commit_offset, db, session, new_offset)
+        return new_offset
+    finally:
+        # Closing releases the lock
+        await run_in_threadpool(fileobj.close)
+
+
+def delete_session(db: Session, session: UploadSession) -> None:
+    """
+    Delete an upload session and its spool file.
+    """
+    _remove_spool(session.id)
+    db.delete(session)
+    db.commit()
+
+
+def to_response(session: UploadSession) -> Dict[str, Any]:
+    """
+    Build the status payload for a session.
+    """
+    return {
+        "session_id": session.id,
+        "file_name": session.file_name,
+        "size": session.size,
+        "offset": session.received,
+        "expires_at": session.expires_at,
+    }
+
+
+def collect_expired(db: Session) -> int:
+    """
+    Delete expired sessions and spool files that have no session.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of sessions deleted
+    """
+    now = datetime.now(timezone.utc)
+    expired = [
+        session_id for (session_id,) in
+        db.query(UploadSession.id).filter(UploadSession.expires_at <= now)
+    ]
+    if expired:
+        db.query(UploadSession).filter(UploadSession.id.in_(expired)).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    for session_id in expired:
+        _remove_spool(session_id)
+
+    # Spool files whose row is gone (e.g. a crash between the two deletes)
+    directory = _spool_dir()
+    if os.path.isdir(directory):
+        cutoff = time.time() - settings.UPLOAD_SESSION_TTL
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            session_id = name.split(".", 1)[0]
+            try:
+                stale = os.path.getmtime(path) < cutoff
+            except FileNotFoundError:
+                continue
+            if stale and db.get(UploadSession, session_id) is None:
+                _remove_spool(session_id)
+    return len(expired)
+
+
+def start() -> None:
+    """
+    Start the periodic garbage collection of expired sessions.
+    """
+    global _gc_task
+    if _gc_task is None:
+        _gc_task = asyncio.create_task(_gc_loop())
+
+
+async def shutdown() -> None:
+    """
+    Stop the garbage collection task.
+    """
+    global _gc_task
+    if _gc_task is not None:
+        _gc_task.cancel()
+        await asyncio.gather(_gc_task, return_exceptions=True)
+        _gc_task = None
+
+
+def _spool_dir() -> str:
+    return os.path.join(settings.UPLOAD_SPOOL_DIR, "sessions")
+
+
+def _expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.UPLOAD_SESSION_TTL)
+
+
+def _claim(db: Session, session: UploadSession, offset: int) -> BinaryIO:
+    # Worker processes on this host share the spool file; an exclusive lock
+    # on it makes one of them the only writer of the session.
+    fileobj = open(spool_path(session.id), "r+b")
+    try:
+        try:
+            fcntl.flock(fileobj.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise OffsetMismatchError(session.received)
+        # Another process may have appended since the session was read
+        db.refresh(session)
+        if offset != session.received:
+            raise OffsetMismatchError(session.received)
+        # Drop anything past the committed offset, e.g. from a write that
+        # was interrupted before its offset was recorded.
+        if os.fstat(fileobj.fileno()).st_size < offset:
+            raise FileNotFoundError(f"Spool file {fileobj.name} is missing committed bytes")
+        fileobj.truncate(offset)
+        fileobj.seek(offset)
+    except BaseException:
+        fileobj.close()
+        raise
+    return fileobj
+
+
+def _commit_offset(db: Session, session: UploadSession, offset: int) -> None:
+    session.received = offset
+    session.expires_at = _expiry()
+    db.commit()
+
+
+def _remove_spool(session_id: str) -> None:
+    try:
+        os.remove(spool_path(session_id))
+    except FileNotFoundError:
+        pass
+
+
+def _collect() -> int:
+    db = SessionLocal()
+    try:
+        return collect_expired(db)
+    finally:
+        db.close()
+
+
+async def _gc_loop() -> None:
+    while True:
+        try:
+            removed = await run_in_threadpool(_collect)
+            if removed:
+                logger.info("Removed %d expired upload sessions", removed)
+        except Exception:
+            logger.exception("Upload session cleanup failed")
+        await asyncio.sleep(settings.UPLOAD_SESSION_GC_INTERVAL)
@@ -1,5 +1,6 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional, List, Iterator, Any
+from sqlalchemy.orm import Session, Query
 from app.models.blog import User, UserRole
 from app.schemas.blog import UserCreate
 from app.core.security import get_password_hash, verify_password
@@ -191,3 +192,91 @@ def get_all_users(db: Session) -> List[User]:
     Get all users (for admin management).
     """
     return db.query(User).all()
+
+
+def _filter_users(
+    query: Query,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Query:
+    """
+    Apply the admin listing filters to a users query.
+    """
+    if role is not None:
+        query = query.filter(User.role == role)
+    if is_active is not None:
+        query = query.filter(User.is_active == is_active)
+    if created_from is not None:
+        query = query.filter(User.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(User.created_at < created_to)
+    return query
+
+
+def get_users_page(
+    db: Session,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> List[User]:
+    """
+    Get one keyset-paginated page of users ordered by ID.
+    
+    Args:
+        db: Database session
+        limit: Maximum number of users to return
+        after_id: Only return users with an ID greater than this cursor
+        role: Optional role filter
+        is_active: Optional active flag filter
+        created_from: Only users created at or after this time
+        created_to: Only users created before this time
+    
+    Returns:
+        Up to ``limit`` users, in ascending ID order
+    """
+    query = _filter_users(db.query(User), role, is_active, created_from, created_to)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    return query.order_by(User.id).limit(limit).all()
+
+
+def iter_users(
+    db: Session,
+    batch_size: int = 1000,
+    role: Optional[UserRole] = None,
+    is_active: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Iterator[Any]:
+    """
+    Stream users for export without loading the whole table.
+    
+    Rows are plain column tuples fetched ``batch_size`` at a time
+    through ``yield_per``, so memory stays flat regardless of table size.
+    
+    Args:
+        db: Database session
+        batch_size: Number of rows fetched per round trip
+        role: Optional role filter
+        is_active: Optional active flag filter
+        created_from: Only users created at or after this time
+        created_to: Only users created before this time
+    
+    Returns:
+        Iterator of (id, email, full_name, role, is_active, created_at) rows
+    """
+    query = db.query(
+        User.id,
+        User.email,
+        User.full_name,
+        User.role,
+        User.is_active,
+        User.created_at,
+    )
+    query = _filter_users(query, role, is_active, created_from, created_to)
+    return query.order_by(User.id).yield_per(batch_size)
@@ -0,0 +1,186 @@
+"""
+Write-buffered post view counter.
+
+``GET /posts/{slug}`` only increments an in-memory counter. Each worker
+flushes its counters to ``post_views`` every ``VIEW_FLUSH_INTERVAL``
+seconds, and on shutdown, as one batched upsert, so reads never wait on a
+write lock on ``posts``.
+
+Memory is bounded by ``VIEW_BUFFER_MAX_POSTS`` distinct posts per worker.
+Reaching it triggers an early flush; views of further posts are dropped,
+and counted in the log, until that flush completes.
+
+Loss window: a worker that dies without a clean shutdown loses the views
+it received since its last flush, i.e. at most ``VIEW_FLUSH_INTERVAL``
+seconds of its traffic. If a flush fails, the counts go back into the
+buffer and are retried with the next flush.
+"""
+import asyncio
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.database import SessionLocal
+from app.core.settings import settings
+from app.models.ranking import PostView
+
+logger = logging.getLogger(__name__)
+
+# post id -> views not yet written to the database
+_counts: Dict[int, int] = {}
+_dropped = 0
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_task: Optional[asyncio.Task] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_wake: Optional[asyncio.Event] = None
+
+
+def record(post_id: int) -> None:
+    """
+    Count one view of a post.
+    """
+    global _dropped
+    with _lock:
+        if post_id in _counts:
+            _counts[post_id] += 1
+            return
+        if len(_counts) >= settings.VIEW_BUFFER_MAX_POSTS:
+            _dropped += 1
+            return
+        _counts[post_id] = 1
+        full = len(_counts) >= settings.VIEW_BUFFER_MAX_POSTS
+    if full and _loop is not None:
+        _loop.call_soon_threadsafe(_wake.set)
+
+
+def get_counts(db: Session, post_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Get the view counts of posts, including this worker's unflushed views.
+
+    Args:
+        db: Database session
+        post_ids: IDs of the posts
+
+    Returns:
+        Views per post ID; posts never viewed are 0
+    """
+    ids = set(post_ids)
+    if not ids:
+        return {}
+    counts = dict.fromkeys(ids, 0)
+    counts.update(db.execute(
+        select(PostView.post_id, PostView.views).where(PostView.post_id.in_(ids))
+    ).all())
+    with _lock:
+        for post_id in ids:
+            counts[post_id] += _counts.get(post_id, 0)
+    return counts
+
+
+def flush() -> int:
+    """
+    Write the buffered views to ``post_views`` in one batched upsert.
+
+    Returns:
+        Number of posts whose counts were written
+    """
+    global _counts, _dropped
+    with _flush_lock:
+        with _lock:
+            pending, _counts = _counts, {}
+            dropped, _dropped = _dropped, 0
+        if dropped:
+            logger.warning("Dropped %d views while the view buffer was full", dropped)
+        if not pending:
+            return 0
+        # Sorted, so concurrent flushes from several workers lock rows in the same order
+        rows = [{"post_id": post_id, "views": views} for post_id, views in sorted(pending.items())]
+        db = SessionLocal()
+        try:
+            _upsert(db, rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            _restore(pending)
+            raise
+        finally:
+            db.close()
+        return len(rows)
+
+
+def start() -> None:
+    """
+    Start flushing buffered views every ``VIEW_FLUSH_INTERVAL`` seconds.
+    """
+    global _task, _loop, _wake
+    if _task is None:
+        _loop = asyncio.get_running_loop()
+        _wake = asyncio.Event()
+        _task = asyncio.create_task(_flush_loop())
+
+
+async def shutdown() -> None:
+    """
+    Stop the flush task and write out the remaining views.
+    """
+    global _task, _loop
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+        _loop = None
+    try:
+        await run_in_threadpool(flush)
+    except Exception:
+        logger.exception("Final view flush failed; buffered views are lost")
+
+
+def _upsert(db: Session, rows: List[Dict[str, int]]) -> None:
+    table = PostView.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert(table)
+        statement = insert.on_conflict_do_update(
+            index_elements=[table.c.post_id],
+            set_={"views": table.c.views + insert.excluded.views, "updated_at": func.now()},
+        )
+        db.execute(statement, rows)
+    elif dialect in ("mysql", "mariadb"):
+        insert = mysql.insert(table)
+        db.execute(insert.on_duplicate_key_update(views=table.c.views + insert.inserted.views), rows)
+    else:
+        for row in rows:
+            updated = db.execute(
+                update(table)
+                .where(table.c.post_id == row["post_id"])
+                .values(views=table.c.views + row["views"])
+            ).rowcount
+            if not updated:
+                db.execute(table.insert(), row)
+
+
+def _restore(pending: Dict[int, int]) -> None:
+    global _dropped
+    with _lock:
+        for post_id, views in pending.items():
+            if post_id in _counts or len(_counts) < settings.VIEW_BUFFER_MAX_POSTS:
+                _counts[post_id] = _counts.get(post_id, 0) + views
+            else:
+                _dropped += views
+
+
+async def _flush_loop() -> None:
+    while True:
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=settings.VIEW_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+        try:
+            await run_in_threadpool(flush)
+        except Exception:
+            logger.exception("View flush failed; retrying with the next flush")
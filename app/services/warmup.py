@@ -0,0 +1,117 @@
+"""
+Startup warmup.
+
+Runs once per worker process in the background after startup, so the
+first real requests do not pay for one-time setup:
+
+- configures the ORM mappers,
+- opens ``WARMUP_POOL_CONNECTIONS`` database connections into the pool,
+- executes the prebuilt hot-path statements, filling SQLAlchemy's
+  compiled-SQL cache,
+- loads the category list and stats and the ``WARMUP_HOT_POSTS`` newest
+  published posts into their caches.
+
+``/health/ready`` reports the process unavailable until this finishes.
+A failed step is logged and skipped; it does not keep the process out of
+rotation, since every cache fills itself on demand.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy.orm import configure_mappers
+from starlette.concurrency import run_in_threadpool
+from app.core.database import SessionLocal, get_engine
+from app.core.settings import settings
+from app.services import category_service, post_cache, post_service
+
+logger = logging.getLogger(__name__)
+
+_task: Optional[asyncio.Task] = None
+_done = False
+# Step name -> duration in ms, or the error it failed with
+_steps: Dict[str, Any] = {}
+
+
+def is_done() -> bool:
+    """
+    Whether warmup has finished (or is disabled).
+    """
+    return _done or not settings.WARMUP_ENABLED
+
+
+def report() -> Dict[str, Any]:
+    """
+    Get the outcome of each warmup step run so far.
+    """
+    return dict(_steps)
+
+
+def start() -> None:
+    """
+    Start warming up in the background.
+    """
+    global _task
+    if _task is None and settings.WARMUP_ENABLED:
+        _task = asyncio.create_task(_run())
+
+
+async def shutdown() -> None:
+    """
+    Cancel warmup if it is still running.
+    """
+    global _task, _done
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+    _done = False
+    _steps.clear()
+
+
+async def _run() -> None:
+    global _done
+    started = time.perf_counter()
+    await run_in_threadpool(_step, "mappers", configure_mappers)
+    await run_in_threadpool(_step, "pool", _open_connections)
+    await run_in_threadpool(_step, "caches", _fill_caches)
+    _done = True
+    logger.info("Warmup finished in %.0f ms: %s", (time.perf_counter() - started) * 1000, _steps)
+
+
+def _step(name: str, func: Any) -> None:
+    started = time.perf_counter()
+    try:
+        func()
+    except Exception as e:
+        logger.exception("Warmup step %s failed", name)
+        _steps[name] = {"error": str(e) or type(e).__name__}
+    else:
+        _steps[name] = {"ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+def _open_connections() -> None:
+    # Hold them all at once so the pool really opens that many
+    engine = get_engine()
+    connections = []
+    try:
+        for _ in range(settings.WARMUP_POOL_CONNECTIONS):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def _fill_caches() -> None:
+    db = SessionLocal()
+    try:
+        category_service.load(db)
+        category_service.load_stats(db)
+        # Also compiles POST_BY_SLUG for lookups that miss the post cache
+        post_service.get_post_by_slug(db, "")
+        if not settings.FAST_JSON_RESPONSES:
+            return
+        for post in post_service.get_hot_posts(db, settings.WARMUP_HOT_POSTS):
+            post_cache.put(post.slug, post.id, post_cache.render(post))
+    finally:
+        db.close()
@@ -0,0 +1,379 @@
+"""
+Synthetic dataset generator for load and benchmark testing.
+
+Builds a production-shaped database: N users, M posts with realistic
+content sizes, and likes and comments spread over posts with a power-law
+(Zipf) distribution so a handful of posts are hot and the long tail is
+quiet. Rows are written with bulk Core inserts, and the output only
+depends on ``--seed``.
+
+Usage:
+    python -m app.synthetic_data --users 20000 --posts 50000 --likes 1000000 --comments 200000
+    python -m app.synthetic_data --database-url sqlite:///./bench.db --drop
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.database import Base
+from app.core.security import get_password_hash
+from app.core.settings import settings
+from app.models.blog import Category, Comment, Like, Post, PostStatus, User, UserRole
+import app.models.upload  # noqa: F401  (register upload tables for create_all)
+import app.models.ranking  # noqa: F401  (register ranking tables for create_all)
+from app.seed import DEFAULT_CATEGORIES
+
+# Every generated user can log in with this password.
+DEFAULT_PASSWORD = "password"
+
+BATCH_SIZE = 10_000
+
+WORDS = (
+    "data system cloud market growth design mobile network product device "
+    "token ledger chain android kotlin platform startup revenue strategy brand "
+    "content search audience campaign engine latency cache server client user "
+    "model training insight future trend secure privacy battery screen camera "
+    "release update feature guide review launch team customer value scale"
+).split()
+
+FIRST_NAMES = (
+    "Ava Liam Noah Emma Mia Omar Sara Yuki Ravi Lena Ivan Nina Hugo Zara Amir "
+    "Chen Lucia Mateo Aisha Jonas Priya Kofi Elena Tariq Ines"
+).split()
+
+LAST_NAMES = (
+    "Rahman Smith Garcia Kim Nguyen Patel Müller Rossi Silva Haddad Novak "
+    "Okafor Tanaka Jensen Costa Ali Murphy Ivanova Khan Dubois"
+).split()
+
+# (status, weight) for generated posts.
+POST_STATUSES = [
+    (PostStatus.PUBLISHED, 90),
+    (PostStatus.PENDING, 6),
+    (PostStatus.DRAFT, 3),
+    (PostStatus.REJECTED, 1),
+]
+
+
+def zipf_weights(n: int, alpha: float) -> List[float]:
+    """
+    Normalized Zipf weights for ranks 1..n.
+    """
+    raw = [1.0 / (rank ** alpha) for rank in range(1, n + 1)]
+    total = sum(raw)
+    return [w / total for w in raw]
+
+
+def capped_counts(total: int, weights: List[float], cap: int) -> List[int]:
+    """
+    Split ``total`` over ``weights`` without any bucket exceeding ``cap``.
+
+    Overflow from capped buckets is redistributed over the remaining ones,
+    so the head of the distribution flattens instead of losing rows.
+    """
+    counts = [0] * len(weights)
+    remaining = min(total, cap * len(weights))
+    open_idx = list(range(len(weights)))
+    while remaining > 0 and open_idx:
+        weight_sum = sum(weights[i] for i in open_idx)
+        assigned = 0
+        still_open = []
+        for i in open_idx:
+            share = int(remaining * weights[i] / weight_sum)
+            share = min(share, cap - counts[i])
+            counts[i] += share
+            assigned += share
+            if counts[i] < cap:
+                still_open.append(i)
+        if assigned == 0:
+            # Rounding left a small remainder; hand it to the head.
+            for i in still_open[:remaining]:
+                counts[i] += 1
+                assigned += 1
+        remaining -= assigned
+        open_idx = still_open
+    return counts
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def random_html(rng: random.Random) -> str:
+    """
+    Article body sized like real posts: log-normal, median ~5 KB.
+    """
+    target_words = max(80, int(rng.lognormvariate(6.6, 0.6)))
+    paragraphs = []
+    while target_words > 0:
+        size = min(target_words, rng.randint(40, 160))
+        paragraphs.append(f"<p>{random_text(rng, size).capitalize()}.</p>")
+        target_words -= size
+    return "\n".join(paragraphs)
+
+
+def random_past(rng: random.Random, start: datetime, end: datetime) -> datetime:
+    span = (end - start).total_seconds()
+    return start + timedelta(seconds=rng.random() * span)
+
+
+def batched(rows: Iterator[Dict[str, Any]], size: int = BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_insert(conn: Connection, table, rows: Iterator[Dict[str, Any]]) -> int:
+    count = 0
+    for batch in batched(rows):
+        conn.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+def next_id(conn: Connection, column) -> int:
+    return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+class DatasetGenerator:
+    """
+    Deterministic generator for users, posts, likes and comments.
+    """
+
+    def __init__(
+        self,
+        users: int,
+        posts: int,
+        likes: int,
+        comments: int,
+        seed: int = 42,
+        alpha: float = 1.1,
+        days: int = 730,
+    ):
+        # Posts need authors, and the first user is the admin
+        if users < 1:
+            raise ValueError("users must be at least 1")
+        for name, count in (("posts", posts), ("likes", likes), ("comments", comments)):
+            if count < 0:
+                raise ValueError(f"{name} must not be negative")
+        self.n_users = users
+        self.n_posts = posts
+        self.n_likes = likes
+        self.n_comments = comments
+        self.alpha = alpha
+        self.rng = random.Random(seed)
+        # Anchor timestamps to a fixed point so the same seed yields the same rows.
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.start = self.now - timedelta(days=days)
+
+    def users(self, first_id: int, password_hash: str) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        for i in range(self.n_users):
+            user_id = first_id + i
+            if i == 0:
+                role = UserRole.ADMIN
+            elif rng.random() < 0.05:
+                role = UserRole.WRITER
+            else:
+                role = UserRole.READER
+            yield {
+                "id": user_id,
+                "email": f"user{user_id}@example.com",
+                "hashed_password": password_hash,
+                "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "avatar": "/avatars/default.jpg",
+                "role": role,
+                "is_active": rng.random() > 0.02,
+                "is_admin": role == UserRole.ADMIN,
+                "created_at": random_past(rng, self.start, self.now),
+            }
+
+    def posts(
+        self,
+        first_id: int,
+        author_ids: List[int],
+        category_ids: List[int],
+    ) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        author_weights = zipf_weights(len(author_ids), self.alpha)
+        statuses = [s for s, _ in POST_STATUSES]
+        status_weights = [w for _, w in POST_STATUSES]
+        for i in range(self.n_posts):
+            post_id = first_id + i
+            title = random_text(rng, rng.randint(4, 10)).title()
+            status = rng.choices(statuses, status_weights)[0]
+            created_at = random_past(rng, self.start, self.now)
+            yield {
+                "id": post_id,
+                "title": title,
+                "slug": f"{title.lower().replace(' ', '-')}-{post_id}",
+                "excerpt": random_text(rng, rng.randint(20, 45)).capitalize() + ".",
+                "content": random_html(rng),
+                "image": f"https://picsum.photos/seed/{post_id}/1200/630",
+                "read_time": f"{rng.randint(2, 15)} min read",
+                "featured": rng.random() < 0.02,
+                "published": status == PostStatus.PUBLISHED,
+                "status": status,
+                "created_at": created_at,
+                "author_id": rng.choices(author_ids, author_weights)[0],
+                "category_id": rng.choice(category_ids),
+            }
+
+    def likes(self, user_ids: List[int], posts: List[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Likes per post follow a Zipf curve capped at one like per user.
+        """
+        rng = self.rng
+        ranked = posts[:]
+        rng.shuffle(ranked)
+        counts = capped_counts(
+            self.n_likes, zipf_weights(len(ranked), self.alpha), len(user_ids)
+        )
+        for (post_id, post_created), count in zip(ranked, counts):
+            if not count:
+                continue
+            for user_id in rng.sample(user_ids, count):
+                yield {
+                    "user_id": user_id,
+                    "post_id": post_id,
+                    "created_at": random_past(rng, post_created, self.now),
+                }
+
+    def comments(self, user_ids: List[int], posts: List[Any]) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        ranked = posts[:]
+        rng.shuffle(ranked)
+        weights = zipf_weights(len(ranked), self.alpha)
+        counts = capped_counts(self.n_comments, weights, self.n_comments)
+        user_weights = zipf_weights(len(user_ids), self.alpha)
+        for (post_id, post_created), count in zip(ranked, counts):
+            if not count:
+                continue
+            authors = rng.choices(user_ids, user_weights, k=count)
+            for author_id in authors:
+                yield {
+                    "content": random_text(rng, rng.randint(5, 60)).capitalize() + ".",
+                    "author_id": author_id,
+                    "post_id": post_id,
+                    "created_at": random_past(rng, post_created, self.now),
+                }
+
+    def run(self, engine: Engine) -> Dict[str, int]:
+        """
+        Insert the whole dataset, one transaction per table.
+        """
+        password_hash = get_password_hash(DEFAULT_PASSWORD)
+        stats = {}
+
+        with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+
+            category_ids = list(conn.execute(select(Category.id)).scalars())
+            if not category_ids:
+                conn.execute(Category.__table__.insert(), DEFAULT_CATEGORIES)
+                category_ids = list(conn.execute(select(Category.id)).scalars())
+
+            first_user = next_id(conn, User.id)
+            stats["users"] = bulk_insert(
+                conn, User.__table__, self.users(first_user, password_hash)
+            )
+            user_ids = list(range(first_user, first_user + self.n_users))
+
+            author_ids = list(
+                conn.execute(
+                    select(User.id)
+                    .where(User.id >= first_user)
+                    .where(User.role.in_([UserRole.ADMIN, UserRole.WRITER]))
+                    .order_by(User.id)
+                ).scalars()
+            )
+            first_post = next_id(conn, Post.id)
+            stats["posts"] = bulk_insert(
+                conn, Post.__table__, self.posts(first_post, author_ids, category_ids)
+            )
+
+            published = conn.execute(
+                select(Post.id, Post.created_at)
+                .where(Post.id >= first_post)
+                .where(Post.status == PostStatus.PUBLISHED)
+                .order_by(Post.id)
+            ).all()
+            published = [
+                (post_id, created.replace(tzinfo=timezone.utc) if created.tzinfo is None else created)
+                for post_id, created in published
+            ]
+
+            stats["likes"] = bulk_insert(conn, Like.__table__, self.likes(user_ids, published))
+            stats["comments"] = bulk_insert(
+                conn, Comment.__table__, self.comments(user_ids, published)
+            )
+
+            if engine.dialect.name == "postgresql":
+                # Explicit IDs bypass the serial sequences; move them past the new rows.
+                for table in ("users", "posts"):
+                    conn.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT MAX(id) FROM {table}))"
+                    ))
+
+        return stats
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Atlania dataset.")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--posts", type=int, default=20_000)
+    parser.add_argument("--likes", type=int, default=1_000_000)
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--alpha", type=float, default=1.1, help="Zipf exponent for popularity")
+    parser.add_argument("--database-url", default=None, help="Defaults to DATABASE_URL")
+    parser.add_argument("--drop", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args(argv)
+
+    try:
+        generator = DatasetGenerator(
+            users=args.users,
+            posts=args.posts,
+            likes=args.likes,
+            comments=args.comments,
+            seed=args.seed,
+            alpha=args.alpha,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    url = args.database_url or settings.DATABASE_URL
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+
+    if args.drop:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    started = time.perf_counter()
+    stats = generator.run(engine)
+    elapsed = time.perf_counter() - started
+
+    summary = ", ".join(f"{count} {name}" for name, count in stats.items())
+    print(f"Inserted {summary} in {elapsed:.1f}s")
+    if stats["likes"] < args.likes:
+        print(
+            f"Note: likes capped at {stats['likes']} "
+            f"(at most one like per user per post)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark entry point for the Atlania app.
+
+Importing this module points the app at the benchmark database and
+replaces external services with local stand-ins, then exposes ``app``.
+Both the in-process ASGI runner and ``uvicorn benchmarks.asgi:app`` load
+the app through here so the two modes see identical configuration.
+
+Uploads go to the ImageKit stand-in by default. Set ``STORAGE_BACKEND=local``
+to write them to ``$BENCH_DIR/media`` through the local storage backend.
+"""
+import os
+from pathlib import Path
+
+import httpx
+
+BENCH_DIR = Path(os.environ.get("BENCH_DIR", ".bench")).resolve()
+BENCH_DB = BENCH_DIR / "bench.db"
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{BENCH_DB}")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("IMAGEKIT_PUBLIC_KEY", "public_bench")
+os.environ.setdefault("IMAGEKIT_PRIVATE_KEY", "private_bench")
+os.environ.setdefault("IMAGEKIT_URL_ENDPOINT", "https://ik.imagekit.io/bench")
+os.environ.setdefault("LOCAL_STORAGE_DIR", str(BENCH_DIR / "media"))
+
+from app.main import app  # noqa: E402
+from app.services import imagekit_service  # noqa: E402
+from benchmarks import imagekit_standin  # noqa: E402
+
+
+# Route storage calls to the in-process ImageKit stand-in; nothing leaves the machine.
+imagekit_service._http_client = httpx.AsyncClient(
+    transport=httpx.ASGITransport(app=imagekit_standin.app),
+    auth=(os.environ["IMAGEKIT_PRIVATE_KEY"], ""),
+)
+
+__all__ = ["app", "BENCH_DB", "BENCH_DIR"]
@@ -0,0 +1,97 @@
+"""
+Local stand-in for the ImageKit upload and files APIs.
+
+Implements just enough of ImageKit's HTTP surface for the storage client:
+upload, file listing (for the readiness ping), file details and delete.
+Run it as a server and point the app at it:
+
+    uvicorn benchmarks.imagekit_standin:app --port 9000
+    IMAGEKIT_UPLOAD_BASE_URL=http://127.0.0.1:9000 \
+    IMAGEKIT_API_BASE_URL=http://127.0.0.1:9000 uvicorn app.main:app
+
+Set ``STANDIN_FAIL_RATE`` (0..1) to answer a share of requests with 503
+and exercise the client's retry path, and ``STANDIN_LATENCY_MS`` to add a
+fixed delay per request.
+"""
+import asyncio
+import os
+import random
+import uuid
+from typing import Dict
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+FAIL_RATE = float(os.environ.get("STANDIN_FAIL_RATE", "0"))
+LATENCY = float(os.environ.get("STANDIN_LATENCY_MS", "0")) / 1000.0
+
+files: Dict[str, dict] = {}
+
+
+async def simulate() -> Response:
+    if LATENCY:
+        await asyncio.sleep(LATENCY)
+    if FAIL_RATE and random.random() < FAIL_RATE:
+        return JSONResponse({"message": "Service unavailable"}, status_code=503)
+    return None
+
+
+async def upload(request: Request) -> Response:
+    failure = await simulate()
+    if failure:
+        return failure
+    async with request.form() as form:
+        upload_file = form["file"]
+        name = form.get("fileName") or upload_file.filename
+        folder = form.get("folder", "/")
+        size = upload_file.size
+    file_id = uuid.uuid4().hex
+    record = {
+        "fileId": file_id,
+        "name": name,
+        "filePath": f"/{folder.strip('/')}/{name}",
+        "url": f"https://ik.imagekit.io/standin/{folder.strip('/')}/{name}",
+        "thumbnailUrl": None,
+        "fileType": "non-image",
+        "size": size,
+        "width": None,
+        "height": None,
+    }
+    files[file_id] = record
+    return JSONResponse(record)
+
+
+async def list_files(request: Request) -> Response:
+    # Only used by the readiness ping, which just needs a 200
+    failure = await simulate()
+    if failure:
+        return failure
+    return JSONResponse([])
+
+
+async def details(request: Request) -> Response:
+    failure = await simulate()
+    if failure:
+        return failure
+    record = files.get(request.path_params["file_id"])
+    if record is None:
+        return JSONResponse({"message": "The requested file does not exist."}, status_code=404)
+    return JSONResponse(record)
+
+
+async def delete(request: Request) -> Response:
+    failure = await simulate()
+    if failure:
+        return failure
+    files.pop(request.path_params["file_id"], None)
+    return Response(status_code=204)
+
+
+app = Starlette(routes=[
+    Route("/api/v1/files/upload", upload, methods=["POST"]),
+    Route("/v1/files", list_files, methods=["GET"]),
+    Route("/v1/files/{file_id}/details", details, methods=["GET"]),
+    Route("/v1/files/{file_id}", delete, methods=["DELETE"]),
+])
@@ -0,0 +1,107 @@
+"""
+Per-request cost of the Prometheus middleware.
+
+Calls a minimal ASGI app directly, with and without ``MetricsMiddleware``,
+and reports the difference per request. The run is repeated in a child
+process with ``PROMETHEUS_MULTIPROC_DIR`` set, since multi-process mode
+writes every sample to a memory-mapped file. Exits 1 when the overhead in
+either mode exceeds ``--max-overhead-us``.
+
+Usage:
+    python -m benchmarks.metrics_overhead --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+SCOPE = {
+    "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+    "method": "GET", "scheme": "http", "path": "/bench", "raw_path": b"/bench",
+    "query_string": b"", "root_path": "", "headers": [],
+}
+
+
+async def plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def time_app(app, requests: int) -> float:
+    # Warm up label children and the event loop first
+    for _ in range(200):
+        await app(dict(SCOPE), receive, send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def measure(requests: int, rounds: int) -> float:
+    """
+    Median per-request overhead of the middleware in microseconds.
+    """
+    from app.core.middleware import MetricsMiddleware
+
+    instrumented = MetricsMiddleware(plain_app)
+    overheads = []
+    for _ in range(rounds):
+        base = asyncio.run(time_app(plain_app, requests))
+        with_metrics = asyncio.run(time_app(instrumented, requests))
+        overheads.append(with_metrics - base)
+    return sorted(overheads)[len(overheads) // 2]
+
+
+def measure_multiprocess(requests: int, rounds: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": directory}
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.metrics_overhead", "--child",
+             "--requests", str(requests), "--rounds", str(rounds)],
+            env=env, capture_output=True, text=True, check=True,
+        )
+    return json.loads(proc.stdout.strip().splitlines()[-1])["overhead_us"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure metrics middleware overhead.")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-overhead-us", type=float, default=50.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    if args.child:
+        print(json.dumps({"overhead_us": measure(args.requests, args.rounds)}))
+        return 0
+
+    results = {
+        "single-process": measure(args.requests, args.rounds),
+        "multi-process": measure_multiprocess(args.requests, args.rounds),
+    }
+    failed = False
+    for mode, overhead in results.items():
+        print(f"{mode:<16}{overhead:>8.1f} us/request")
+        if overhead > args.max_overhead_us:
+            print(f"FAIL: {mode} overhead exceeds {args.max_overhead_us} us")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
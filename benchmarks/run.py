@@ -0,0 +1,412 @@
+"""
+Endpoint benchmark suite.
+
+Drives the FastAPI app against a seeded SQLite database and reports
+throughput and latency percentiles per endpoint.
+
+Modes:
+    asgi    In-process through httpx's ASGI transport (no sockets).
+    server  Real uvicorn process on localhost, driven over HTTP with
+            ``--concurrency`` requests in flight.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --mode server --concurrency 32
+    python -m benchmarks.run --update-baseline
+
+Results are written to ``--output`` as JSON and compared with the
+committed ``benchmarks/baseline.json``; the exit status is 1 when any
+endpoint regresses beyond ``--tolerance``. Baselines are kept per mode and
+concurrency (e.g. ``server-c8``), since throughput and latency change with
+the number of requests in flight; a run with no matching baseline is not
+compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.asgi import BENCH_DB, BENCH_DIR
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# Small enough to seed in a few seconds, large enough for realistic plans.
+DATASET = {"users": 2_000, "posts": 3_000, "likes": 60_000, "comments": 15_000}
+
+# A tiny valid PNG padded to roughly the size of a small avatar.
+UPLOAD_BYTES = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"
+    b"\x08\x02\x00\x00\x00\x90wS\xde" + os.urandom(64 * 1024)
+)
+
+# Files per request in the batch upload scenario.
+BATCH_FILES = 10
+
+
+def ensure_dataset(seed: int) -> None:
+    """
+    Build the benchmark database once; later runs reuse it.
+    """
+    if BENCH_DB.exists():
+        # Reused database: add any tables introduced since it was built, or
+        # rebuild it when an existing table has gained columns.
+        from sqlalchemy import create_engine, inspect
+        from app.core.database import Base
+        import app.models.upload  # noqa: F401
+
+        engine = create_engine(f"sqlite:///{BENCH_DB}")
+        inspector = inspect(engine)
+        stale = any(
+            {c.name for c in table.columns} - {c["name"] for c in inspector.get_columns(table.name)}
+            for table in Base.metadata.sorted_tables
+            if inspector.has_table(table.name)
+        )
+        if not stale:
+            Base.metadata.create_all(engine)
+        engine.dispose()
+        if not stale:
+            return
+        print(f"{BENCH_DB} predates the current schema; rebuilding it")
+        BENCH_DB.unlink()
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    from app.synthetic_data import main as generate
+
+    generate([
+        "--database-url", f"sqlite:///{BENCH_DB}",
+        "--seed", str(seed),
+        *[arg for name, count in DATASET.items() for arg in (f"--{name}", str(count))],
+    ])
+
+
+def load_fixtures(seed: int) -> Dict[str, Any]:
+    """
+    Pick the IDs, slugs and credentials the scenarios will hit.
+    """
+    from sqlalchemy import create_engine, select
+    from app.core.security import create_access_token
+    from app.models.blog import Post, PostStatus, User, UserRole
+
+    engine = create_engine(f"sqlite:///{BENCH_DB}")
+    with engine.connect() as conn:
+        posts = conn.execute(
+            select(Post.id, Post.slug)
+            .where(Post.status == PostStatus.PUBLISHED)
+            .order_by(Post.id)
+        ).all()
+        user_id, email = conn.execute(
+            select(User.id, User.email)
+            .where(User.role == UserRole.ADMIN)
+            .order_by(User.id)
+        ).first()
+    engine.dispose()
+
+    rng = random.Random(seed)
+    sample = rng.sample(posts, min(200, len(posts)))
+    from app.synthetic_data import DEFAULT_PASSWORD
+
+    return {
+        "post_ids": [p.id for p in sample],
+        "slugs": [p.slug for p in sample],
+        "email": email,
+        "password": DEFAULT_PASSWORD,
+        "token": create_access_token(user_id),
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], errors: int, wall: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / wall, 2) if wall else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+    }
+
+
+Scenario = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def build_scenarios(fx: Dict[str, Any]) -> Dict[str, Tuple[Optional[Scenario], Scenario]]:
+    """
+    Map endpoint name to an optional untimed setup step and the timed request.
+    """
+    auth = {"Authorization": f"Bearer {fx['token']}"}
+    post_ids = fx["post_ids"]
+    slugs = fx["slugs"]
+
+    async def feed(client, i):
+        return await client.get("/api/v1/posts/", params={"limit": 20})
+
+    async def post_by_slug(client, i):
+        return await client.get(f"/api/v1/posts/{slugs[i % len(slugs)]}")
+
+    async def comments(client, i):
+        return await client.get(f"/api/v1/interactions/posts/{post_ids[i % len(post_ids)]}/comments")
+
+    async def login(client, i):
+        return await client.post(
+            "/api/v1/auth/login",
+            data={"username": fx["email"], "password": fx["password"]},
+        )
+
+    async def unlike(client, i):
+        # Untimed: clear any earlier like so every timed like succeeds.
+        post_id = post_ids[i % len(post_ids)]
+        return await client.delete(f"/api/v1/interactions/posts/{post_id}/like", headers=auth)
+
+    async def like(client, i):
+        post_id = post_ids[i % len(post_ids)]
+        return await client.post(f"/api/v1/interactions/posts/{post_id}/like", headers=auth)
+
+    async def upload(client, i):
+        # Unique content per request so every upload reaches storage.
+        return await client.post(
+            "/api/v1/upload/image",
+            files={"file": (f"bench-{i}.png", UPLOAD_BYTES + os.urandom(16), "image/png")},
+            headers=auth,
+        )
+
+    async def upload_duplicate(client, i):
+        return await client.post(
+            "/api/v1/upload/image",
+            files={"file": (f"bench-{i}.png", UPLOAD_BYTES, "image/png")},
+            headers=auth,
+        )
+
+    async def upload_batch(client, i):
+        files = [
+            ("files", (f"bench-{i}-{n}.png", UPLOAD_BYTES + os.urandom(16), "image/png"))
+            for n in range(BATCH_FILES)
+        ]
+        return await client.post("/api/v1/upload/batch", files=files, headers=auth)
+
+    return {
+        "feed": (None, feed),
+        "post_by_slug": (None, post_by_slug),
+        "comments": (None, comments),
+        "login": (None, login),
+        "like": (unlike, like),
+        "upload": (None, upload),
+        "upload_duplicate": (None, upload_duplicate),
+        "upload_batch": (None, upload_batch),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    steps: Tuple[Optional[Scenario], Scenario],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> Dict[str, float]:
+    setup, scenario = steps
+    for i in range(warmup):
+        if setup:
+            await setup(client, i)
+        await scenario(client, i)
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            if setup:
+                await setup(client, i)
+            started = time.perf_counter()
+            try:
+                response = await scenario(client, i)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    # Setup steps count towards wall time, so throughput for scenarios with
+    # setup (like) measures full cycles; latency percentiles stay exact.
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - wall_start)
+
+
+async def run_asgi(scenarios, args) -> Dict[str, Any]:
+    from benchmarks.asgi import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return {
+                name: await run_scenario(client, fn, args.requests, args.concurrency, args.warmup)
+                for name, fn in scenarios.items()
+            }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("benchmark server exited during startup")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("benchmark server did not become healthy")
+
+
+async def run_server(scenarios, args) -> Dict[str, Any]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, "-m", "uvicorn", "benchmarks.asgi:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, env=os.environ.copy())
+    try:
+        wait_for_server(base_url, process)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+            return {
+                name: await run_scenario(client, fn, args.requests, args.concurrency, args.warmup)
+                for name, fn in scenarios.items()
+            }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def baseline_key(mode: str, concurrency: int) -> str:
+    """
+    Key of the baseline entry for runs in ``mode`` at ``concurrency``.
+    """
+    return f"{mode}-c{concurrency}"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    List endpoints whose p95 or throughput is worse than baseline by more than ``tolerance``.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.1f}ms vs baseline {base['p95_ms']:.1f}ms"
+            )
+        if base["throughput_rps"] and current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['throughput_rps']:.1f} req/s vs baseline {base['throughput_rps']:.1f} req/s"
+            )
+        if current["errors"] and not base["errors"]:
+            regressions.append(f"{name}: {current['errors']} failed requests")
+    return regressions
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    header = f"{'endpoint':<18}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<18}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.2f}"
+            f"{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['errors']:>8}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Atlania API endpoints.")
+    parser.add_argument("--mode", choices=["asgi", "server"], default="asgi")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers in server mode")
+    parser.add_argument("--only", nargs="*", help="Run only these endpoints")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=str(BENCH_DIR / "results.json"))
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    ensure_dataset(args.seed)
+    scenarios = build_scenarios(load_fixtures(args.seed))
+    if args.only:
+        scenarios = {name: fn for name, fn in scenarios.items() if name in args.only}
+
+    runner = run_asgi if args.mode == "asgi" else run_server
+    results = asyncio.run(runner(scenarios, args))
+    print_table(results)
+
+    report = {
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults written to {args.output}")
+
+    baseline_path = Path(args.baseline)
+    baselines = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    key = baseline_key(args.mode, args.concurrency)
+    if args.update_baseline:
+        # Merge so a partial run (--only) refreshes just those endpoints.
+        baselines.setdefault(key, {}).update(results)
+        baseline_path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline for '{key}' updated in {baseline_path}")
+        return 0
+
+    if key not in baselines:
+        print(f"\nNo baseline for '{key}'; record one with --update-baseline.")
+        return 0
+    regressions = compare(results, baselines[key], args.tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Response serialization microbenchmark.
+
+Serves the same feed of in-memory ORM posts (with nested author, category
+and comments, no database) through two routes: one returning the ORM
+objects for FastAPI's ``response_model`` handling, and one returning
+``model_response``. Both are called directly as ASGI apps so only
+validation and encoding are measured.
+
+Usage:
+    python -m benchmarks.serialization --posts 100 --comments 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ["FAST_JSON_RESPONSES"] = "true"
+
+from fastapi import FastAPI  # noqa: E402
+
+from app.api.responses import model_response  # noqa: E402
+from app.models.blog import Category, Comment, Post, PostStatus, User, UserRole  # noqa: E402
+from app.schemas.blog import Post as PostSchema  # noqa: E402
+
+
+def build_feed(posts: int, comments: int) -> List[Post]:
+    """
+    Transient ORM posts shaped like a feed page.
+    """
+    started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    category = Category(id=1, name="Technology", slug="technology")
+    authors = [
+        User(id=i, email=f"user{i}@example.com", full_name=f"User {i}",
+             avatar="/avatars/default.jpg", role=UserRole.WRITER, is_active=True,
+             created_at=started)
+        for i in range(1, 21)
+    ]
+    feed = []
+    for i in range(1, posts + 1):
+        post = Post(
+            id=i, title=f"Post {i}", slug=f"post-{i}", excerpt="An excerpt " * 8,
+            content="Body text. " * 200, image=f"https://ik.imagekit.io/bench/{i}.jpg",
+            image_variants={str(w): f"https://ik.imagekit.io/bench/tr:w-{w}/{i}.jpg" for w in (320, 640, 1280)},
+            read_time="5 min", featured=i % 10 == 0, status=PostStatus.PUBLISHED,
+            author_id=authors[i % 20].id, category_id=1,
+            created_at=started + timedelta(minutes=i), updated_at=None,
+            author=authors[i % 20], category=category,
+        )
+        post.comments = [
+            Comment(id=i * 1000 + n, content="Nice post! " * 4, post_id=i,
+                    author_id=authors[n % 20].id, author=authors[n % 20],
+                    created_at=started + timedelta(minutes=i, seconds=n))
+            for n in range(comments)
+        ]
+        post.likes_count = i * 3
+        feed.append(post)
+    return feed
+
+
+def build_app(feed: List[Post]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=List[PostSchema])
+    def default_path() -> Any:
+        return feed
+
+    @app.get("/fast", response_model=List[PostSchema])
+    def fast_path() -> Any:
+        return model_response(List[PostSchema], feed)
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [], "app": app,
+    }
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return bytes(body)
+
+
+async def time_path(app: FastAPI, path: str, iterations: int) -> float:
+    for _ in range(3):
+        await call(app, path)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await call(app, path)
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare response serialization paths.")
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--comments", type=int, default=10, help="Comments per post")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    app = build_app(build_feed(args.posts, args.comments))
+    default_body = asyncio.run(call(app, "/default"))
+    fast_body = asyncio.run(call(app, "/fast"))
+    if json.loads(default_body) != json.loads(fast_body):
+        print("FAIL: the two paths produce different JSON")
+        return 1
+
+    default_ms = asyncio.run(time_path(app, "/default", args.iterations))
+    fast_ms = asyncio.run(time_path(app, "/fast", args.iterations))
+    print(f"{args.posts} posts x {args.comments} comments, {len(fast_body) / 1024:.0f} KiB per response")
+    print(f"{'response_model':<16}{default_ms:>9.2f} ms")
+    print(f"{'model_response':<16}{fast_ms:>9.2f} ms  ({default_ms / fast_ms:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Throughput scaling of the production launcher with worker count.
+
+Starts ``python -m app.server`` against the benchmark database once per
+worker count, drives read endpoints over HTTP with ``--concurrency``
+requests in flight, and reports throughput and speedup over one worker.
+Worker recycling is disabled so restarts do not show up as noise.
+
+Usage:
+    python -m benchmarks.server_scaling --workers 1 2 4 --concurrency 32
+
+Speedup is bounded by the cores available to the server and the load
+generator together; the machine's CPU count is printed with the results.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.run import (
+    BENCH_DB,
+    build_scenarios,
+    ensure_dataset,
+    free_port,
+    load_fixtures,
+    run_scenario,
+    wait_for_server,
+)
+
+SCENARIOS = ("feed", "post_by_slug")
+
+
+async def drive(base_url: str, scenarios, args) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        return {
+            name: await run_scenario(client, scenarios[name], args.requests, args.concurrency, args.warmup)
+            for name in SCENARIOS
+        }
+
+
+def run_with_workers(workers: int, scenarios, args) -> Dict[str, Any]:
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": os.environ.get("DATABASE_URL", f"sqlite:///{BENCH_DB}"),
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret-key"),
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        "SERVER_MAX_REQUESTS": "0",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--app", "benchmarks.asgi:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_for_server(base_url, process)
+        return asyncio.run(drive(base_url, scenarios, args))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure throughput against worker count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    ensure_dataset(args.seed)
+    scenarios = build_scenarios(load_fixtures(args.seed))
+
+    results = {workers: run_with_workers(workers, scenarios, args) for workers in args.workers}
+    print(f"CPUs: {os.cpu_count()}, concurrency: {args.concurrency}\n")
+    header = f"{'endpoint':<16}{'workers':>8}{'req/s':>10}{'p95 ms':>10}{'speedup':>9}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name in SCENARIOS:
+        single = results[args.workers[0]][name]["throughput_rps"]
+        for workers, by_name in results.items():
+            r = by_name[name]
+            speedup = r["throughput_rps"] / single if single else 0.0
+            print(
+                f"{name:<16}{workers:>8}{r['throughput_rps']:>10.1f}"
+                f"{r['p95_ms']:>10.2f}{speedup:>8.2f}x{r['errors']:>8}"
+            )
+    return 1 if any(r["errors"] for by_name in results.values() for r in by_name.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
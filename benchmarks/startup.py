@@ -0,0 +1,150 @@
+"""
+Cold-start benchmark.
+
+Starts fresh interpreters that import ``app.main`` under ``-X importtime``
+and serve one request (a DB-backed endpoint, so lazy engine creation is
+included), then reports the median import time, first-request time and
+whole-process time. The slowest top-level packages from the median run
+are listed to show where import time goes.
+
+Usage:
+    python -m benchmarks.startup --runs 7
+    python -m benchmarks.startup --update-baseline
+
+Results are compared with the ``startup`` entry of
+``benchmarks/baseline.json``; the exit status is 1 when a metric regresses
+beyond ``--tolerance``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.run import BASELINE_PATH, BENCH_DB, ensure_dataset
+
+# Runs in the child interpreter. Avoids httpx so the client does not add
+# to the measured imports.
+CHILD = r"""
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def first_request():
+    path = "/api/v1/categories/"
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"startup")],
+        "client": ("127.0.0.1", 0), "server": ("startup", 80),
+    }
+    statuses = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+    await app.main.app(scope, receive, send)
+    return statuses[0]
+
+status = asyncio.run(first_request())
+served = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (served - imported) * 1000,
+    "status": status,
+}))
+"""
+
+METRICS = ("import_ms", "first_request_ms", "process_ms")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse ``-X importtime`` output into (module, self_us, cumulative_us) rows.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        rows.append((name, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once() -> Dict[str, Any]:
+    env = {
+        **os.environ,
+        "DATABASE_URL": os.environ.get("DATABASE_URL", f"sqlite:///{BENCH_DB}"),
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret-key"),
+    }
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = elapsed
+    result["imports"] = parse_importtime(proc.stderr)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure app cold-start time.")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    ensure_dataset(seed=42)
+    runs = [run_once() for _ in range(args.runs)]
+    if any(run["status"] != 200 for run in runs):
+        print(f"FAIL: first request returned HTTP {[run['status'] for run in runs]}")
+        return 1
+
+    results = {metric: statistics.median(run[metric] for run in runs) for metric in METRICS}
+    for metric in METRICS:
+        print(f"{metric:<18}{results[metric]:>10.1f}")
+
+    median_run = sorted(runs, key=lambda run: run["import_ms"])[len(runs) // 2]
+    packages = sorted(
+        (row for row in median_run["imports"] if "." not in row[0]),
+        key=lambda row: row[2], reverse=True,
+    )
+    print(f"\nSlowest top-level imports (cumulative ms):")
+    for name, _, cumulative in packages[: args.top]:
+        print(f"  {name:<28}{cumulative / 1000:>8.1f}")
+
+    baseline_path = Path(args.baseline)
+    baselines = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    if args.update_baseline:
+        baselines["startup"] = {metric: round(value, 2) for metric, value in results.items()}
+        baseline_path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"\nStartup baseline updated in {baseline_path}")
+        return 0
+
+    base = baselines.get("startup", {})
+    regressions = [
+        f"{metric}: {results[metric]:.1f}ms vs baseline {base[metric]:.1f}ms"
+        for metric in METRICS
+        if base.get(metric) and results[metric] > base[metric] * (1 + args.tolerance)
+    ]
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
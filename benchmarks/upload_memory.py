@@ -0,0 +1,114 @@
+"""
+Peak-memory check for streaming uploads.
+
+Streams a large multipart upload through the app in-process and records
+the peak Python heap with tracemalloc. Exits 1 if the peak exceeds
+``--max-peak-mb``, which would mean a handler buffered the file body.
+
+Usage:
+    python -m benchmarks.upload_memory --size-mb 200
+"""
+import argparse
+import asyncio
+import sys
+import tracemalloc
+import uuid
+from typing import AsyncIterator, List, Optional
+
+import httpx
+
+from benchmarks.asgi import app
+from benchmarks.run import ensure_dataset, load_fixtures
+
+CHUNK = 1024 * 1024
+
+
+async def multipart_body(
+    boundary: str, filename: str, content_type: str, size: int
+) -> AsyncIterator[bytes]:
+    """
+    Generate a multipart body with a ``size``-byte file, one chunk at a time.
+    """
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    block = b"\0" * CHUNK
+    remaining = size
+    while remaining > 0:
+        yield block[: min(CHUNK, remaining)]
+        remaining -= CHUNK
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+async def upload(
+    client: httpx.AsyncClient, path: str, content_type: str, size: int, token: str
+) -> httpx.Response:
+    boundary = uuid.uuid4().hex
+    return await client.post(
+        path,
+        content=multipart_body(boundary, "big.bin", content_type, size),
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        },
+        timeout=None,
+    )
+
+
+async def measure(size: int, token: str) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        tracemalloc.start()
+        accepted = await upload(client, "/api/v1/upload/video", "video/mp4", size, token)
+        _, accepted_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        # One chunk past the image limit: must be cut off with 413.
+        from app.core.settings import settings
+        oversized = await upload(
+            client, "/api/v1/upload/image", "image/png",
+            settings.MAX_IMAGE_UPLOAD_SIZE + CHUNK, token,
+        )
+        _, rejected_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "accepted_status": accepted.status_code,
+        "accepted_peak_mb": accepted_peak / CHUNK,
+        "oversized_status": oversized.status_code,
+        "oversized_peak_mb": rejected_peak / CHUNK,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure peak memory of streaming uploads.")
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--max-peak-mb", type=float, default=32.0)
+    args = parser.parse_args(argv)
+
+    ensure_dataset(seed=42)
+    token = load_fixtures(seed=42)["token"]
+    result = asyncio.run(measure(args.size_mb * CHUNK, token))
+
+    print(f"{args.size_mb} MB upload: HTTP {result['accepted_status']}, "
+          f"peak heap {result['accepted_peak_mb']:.1f} MB")
+    print(f"Oversized image: HTTP {result['oversized_status']}, "
+          f"peak heap {result['oversized_peak_mb']:.1f} MB")
+
+    failures = []
+    if result["accepted_status"] != 200:
+        failures.append("large upload was not accepted")
+    if result["oversized_status"] != 413:
+        failures.append("oversized upload was not rejected with 413")
+    for key in ("accepted_peak_mb", "oversized_peak_mb"):
+        if result[key] > args.max_peak_mb:
+            failures.append(f"{key} {result[key]:.1f} MB exceeds {args.max_peak_mb} MB")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
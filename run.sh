@@ -8,6 +8,11 @@ if [ -d "venv" ]; then
     source venv/bin/activate
 fi
 
-# Run uvicorn from the backend root
+# Run from the backend root: a single auto-reloading process with --reload
+# (development), otherwise the multi-worker production server
 echo "Starting Atlania Backend..."
-uvicorn app.main:app --reload
+if [ "$1" = "--reload" ]; then
+    uvicorn app.main:app --reload
+else
+    python -m app.server
+fi
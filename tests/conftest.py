@@ -0,0 +1,46 @@
+"""
+Test configuration.
+
+Points the app at a throwaway SQLite database and local storage directory
+before anything imports ``app``, so tests never touch ImageKit.
+"""
+import os
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix="atlania-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["IMAGEKIT_PUBLIC_KEY"] = "public_test"
+os.environ["IMAGEKIT_PRIVATE_KEY"] = "private_test"
+os.environ["IMAGEKIT_URL_ENDPOINT"] = "https://ik.imagekit.io/test"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["LOCAL_STORAGE_DIR"] = os.path.join(TEST_DIR, "media")
+
+import pytest  # noqa: E402
+
+from app.core.database import Base, SessionLocal, get_engine  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.blog import User, UserRole  # noqa: E402
+
+
+def _create_user(email: str, role: UserRole) -> int:
+    Base.metadata.create_all(get_engine())
+    db = SessionLocal()
+    try:
+        user = User(email=email, full_name=role.value.title(), role=role, is_admin=role == UserRole.ADMIN)
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def writer_token() -> str:
+    return create_access_token(_create_user("writer@example.com", UserRole.WRITER))
+
+
+@pytest.fixture(scope="session")
+def admin_id() -> int:
+    return _create_user("admin@example.com", UserRole.ADMIN)
@@ -0,0 +1,23 @@
+"""
+Only login tokens authenticate API requests.
+"""
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.core.security import create_access_token
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_login_token_authenticates(admin_id):
+    token = create_access_token(admin_id)
+    response = client.get("/api/v1/admin/users", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+
+def test_profile_token_is_not_a_login_token(admin_id):
+    token = profiling.create_token(admin_id)
+    assert profiling.verify_token(token)
+    response = client.get("/api/v1/admin/users", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401